@@ -1,3 +1,5 @@
+import sys
+
 def register_commands(subparsers_action):
     """Add a greet command with arguments"""
     greet_parser = subparsers_action.add_parser(
@@ -39,10 +41,10 @@ def greet_command(args):
     """Execute the greet command"""
     greeting = f"Good day to you, {args.name}" if args.formal else f"Hi {args.name}"
     
-    if args.volume == "quiet":
-        greeting = greeting.lower()
-    elif args.volume == "loud":
-        greeting = greeting.upper() + "!!!"
+    greeting = {
+        "quiet": greeting.lower(),
+        "normal": greeting,
+        "loud": f"{greeting.upper()}!!!",
+    }[args.volume]
     
-    for _ in range(args.repeat):
-        print(greeting)
+    sys.stdout.write(f"{greeting}\n" * args.repeat)
@@ -1,31 +1,28 @@
-import argparse
 import os
 import re
 import sys
 import json
-import shutil
-import subprocess
-import requests
+import stat
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import hashlib
-import zipfile
-import io
-import importlib
 from collections import OrderedDict
-from pathlib import Path
+from functools import lru_cache
+from types import SimpleNamespace
 
-PRYZMA_PATH = os.path.abspath(os.path.dirname(__file__))
-PROJECTS_PATH = os.path.abspath(os.path.join(PRYZMA_PATH, "projects"))
-VENVS_PATH = os.path.abspath(os.path.join(PRYZMA_PATH, "venvs"))
-CONFIG_PATHS = [
-    os.path.join(PRYZMA_PATH, "config.json"),
-    os.path.expanduser("~/.pryzma/config.json")
-]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PRYZMA_HOME points a compiled (e.g. Nuitka) build of the manager back at the checkout
+PRYZMA_PATH = os.path.abspath(os.environ.get("PRYZMA_HOME") or os.path.dirname(__file__))
+PROJECTS_PATH = os.path.join(PRYZMA_PATH, "projects")
+VENVS_PATH = os.path.join(PRYZMA_PATH, "venvs")
 
 
 PACKAGES_DIR = os.path.join(PRYZMA_PATH, "Pryzma-programming-language", "packages")
-PLUGINS_DIR = os.path.abspath(os.path.join(PRYZMA_PATH, "plugins"))
+PLUGINS_DIR = os.path.join(PRYZMA_PATH, "plugins")
+MINIMAL_TEMPLATE_PATH = os.path.join(PRYZMA_PATH, "minimal.py")
+ICTFD_SCRIPT = os.path.join(PRYZMA_PATH, "tools", "ictfd.py")
 PLUGIN_DISABLED_PREFIX = "DISABLED_"
 
 TEMPLATES = {
@@ -55,6 +52,27 @@ TEMPLATES = {
     },
 }
 
+TEMPLATE_NAMES = tuple(TEMPLATES)
+TEMPLATE_MENU = "".join(f"  {name}: {info['description']}\n" for name, info in TEMPLATES.items())
+
+# Template files pre-split around the project name placeholder, so creating a
+# project is just a join: name -> ((path parts, encoded content parts), ...)
+TEMPLATE_PLACEHOLDER = "{project_name}"
+COMPILED_TEMPLATE_FILES = {
+    name: tuple(
+        (tuple(rel_path.split(TEMPLATE_PLACEHOLDER)),
+         tuple(part.encode() for part in content.split(TEMPLATE_PLACEHOLDER)))
+        for rel_path, content in info["files"].items()
+    )
+    for name, info in TEMPLATES.items()
+}
+
+# Environment variable values that switch an option on (e.g. PRYZMA_NO_PLUGINS=1)
+TRUTHY_ENV_VALUES = frozenset({"1", "true", "yes"})
+
+# Answers accepted as "yes" by prompts that default to yes
+YES_ANSWERS = {"", "y", "yes"}
+
 # Build cache directory for incremental/reproducible builds
 BUILD_CACHE_DIR = os.path.join(PRYZMA_PATH, ".build_cache")
 MAX_BUILD_CACHE_ENTRIES = 50
@@ -66,6 +84,8 @@ def compute_manifest_hash(ordered_files):
     Hash is computed from file contents in order. Missing files are skipped but
     their path is still incorporated to avoid collisions.
     """
+    import hashlib
+
     h = hashlib.sha256()
     for path in ordered_files:
         h.update(path.encode('utf-8'))
@@ -87,6 +107,8 @@ def prune_build_cache(max_entries=MAX_BUILD_CACHE_ENTRIES):
 
     Oldest directories (by mtime) are removed first.
     """
+    import shutil
+
     try:
         if not os.path.isdir(BUILD_CACHE_DIR):
             return
@@ -109,6 +131,8 @@ def prune_build_cache(max_entries=MAX_BUILD_CACHE_ENTRIES):
 
 def clear_build_cache():
     """Remove entire build cache directory."""
+    import shutil
+
     try:
         if os.path.isdir(BUILD_CACHE_DIR):
             shutil.rmtree(BUILD_CACHE_DIR)
@@ -121,6 +145,8 @@ def clear_build_cache():
 
 def _copy_tree(src, dst):
     """Recursively copy files from src to dst. Creates dst if necessary."""
+    import shutil
+
     if not os.path.exists(src):
         return
     os.makedirs(dst, exist_ok=True)
@@ -150,11 +176,34 @@ notes
 *.swp
 *.swo
 """
+GITIGNORE_BYTES = (GITIGNORE_TEMPLATE.strip() + "\n").encode()
+
+def scan_plugins_dir():
+    """Return the plugin directories in PLUGINS_DIR sorted by name, or None if it's missing.
 
-def load_plugins(main_parser):
-    """Load all enabled plugins that have valid metadata and command files"""
-    if not os.path.exists(PLUGINS_DIR):
+    DirEntry.is_dir() uses the type from the directory listing, so stray files
+    are dropped without a stat per entry.
+    """
+    try:
+        with os.scandir(PLUGINS_DIR) as it:
+            return sorted((entry for entry in it if entry.is_dir()), key=lambda entry: entry.name)
+    except FileNotFoundError:
         print("[plugins] No plugins directory found")
+        return None
+
+
+def load_plugins(main_parser, command=None):
+    """Load all enabled plugins that have valid metadata and command files.
+
+    Plugins that list their commands in metadata.json ("commands": [...]) are
+    only imported when `command` is one of them, otherwise their commands are
+    added as stubs so they still show up in help and choices.
+    """
+    import argparse
+    import importlib.util
+
+    entries = scan_plugins_dir()
+    if entries is None:
         return
 
     if not any(isinstance(action, argparse._SubParsersAction)
@@ -173,39 +222,51 @@ def load_plugins(main_parser):
 
     loaded_count = 0
     skipped_count = 0
+    deferred_count = 0
 
-    for plugin_name in sorted(os.listdir(PLUGINS_DIR)):
+    for entry in entries:
+        plugin_name = entry.name
         if plugin_name.startswith(PLUGIN_DISABLED_PREFIX):
             skipped_count += 1
             continue
 
-        plugin_dir = os.path.join(PLUGINS_DIR, plugin_name)
-        metadata_path = os.path.join(plugin_dir, "metadata.json")
-        commands_path = os.path.join(plugin_dir, "commands.py")
+        # entry.path is already joined, so plain concatenation is enough
+        metadata_path = f"{entry.path}{os.sep}metadata.json"
+        commands_path = f"{entry.path}{os.sep}commands.py"
 
-        if not os.path.exists(metadata_path):
+        try:
+            metadata = _load_json_cached(metadata_path)
+        except (FileNotFoundError, NotADirectoryError):
             print(f"[plugins] Skipping '{plugin_name}': missing metadata.json")
             skipped_count += 1
             continue
-
-        if not os.path.exists(commands_path):
-            print(f"[plugins] Skipping '{plugin_name}': missing commands.py")
+        except json.JSONDecodeError:
+            print(f"[plugins] Skipping '{plugin_name}': invalid metadata.json")
             skipped_count += 1
             continue
 
-        try:
-            with open(metadata_path) as f:
-                metadata = json.load(f)
+        if not isinstance(metadata, dict):
+            print(f"[plugins] Skipping '{plugin_name}': invalid metadata format")
+            skipped_count += 1
+            continue
 
-            if not isinstance(metadata, dict):
-                print(f"[plugins] Skipping '{plugin_name}': invalid metadata format")
-                skipped_count += 1
-                continue
+        declared = metadata.get("commands")
+        if isinstance(declared, list) and command not in declared:
+            for name in declared:
+                subparsers_action.add_parser(name, help=metadata.get("description"))
+            deferred_count += 1
+            continue
 
-            spec = importlib.util.spec_from_file_location(
-                f"plugins.{plugin_name}", commands_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+        try:
+            # Plugins are only executed once per process, commands.py bytecode
+            # is cached in __pycache__ by the source loader
+            module_name = f"plugins.{plugin_name}"
+            module = sys.modules.get(module_name)
+            if module is None:
+                spec = importlib.util.spec_from_file_location(module_name, commands_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                sys.modules[module_name] = module
 
             if hasattr(module, "register_commands"):
                 module.register_commands(subparsers_action)
@@ -217,8 +278,12 @@ def load_plugins(main_parser):
                 print(f"[plugins] Skipping '{plugin_name}': no register_commands()")
                 skipped_count += 1
 
-        except json.JSONDecodeError:
-            print(f"[plugins] Skipping '{plugin_name}': invalid metadata.json")
+        except FileNotFoundError as e:
+            # commands.py isn't checked up front, the loader reports it missing
+            if e.filename == commands_path:
+                print(f"[plugins] Skipping '{plugin_name}': missing commands.py")
+            else:
+                print(f"[plugins] Error loading '{plugin_name}': {str(e)}")
             skipped_count += 1
         except ImportError as e:
             print(f"[plugins] Failed to import '{plugin_name}': {str(e)}")
@@ -227,19 +292,23 @@ def load_plugins(main_parser):
             print(f"[plugins] Error loading '{plugin_name}': {str(e)}")
             skipped_count += 1
 
-    print(f"[plugins] Loaded {loaded_count} plugins, skipped {skipped_count}")
+    summary = f"[plugins] Loaded {loaded_count} plugins, skipped {skipped_count}"
+    if deferred_count:
+        summary += f", deferred {deferred_count}"
+    print(summary)
 
 def list_plugins(show_all=False):
     """List all available plugins"""
-    if not os.path.exists(PLUGINS_DIR):
-        print("[plugins] No plugins directory found")
+    entries = scan_plugins_dir()
+    if entries is None:
         return []
 
     plugins = []
-    for name in sorted(os.listdir(PLUGINS_DIR)):
-        disabled = name.startswith(PLUGIN_DISABLED_PREFIX)
-        real_name = name[len(PLUGIN_DISABLED_PREFIX):] if disabled else name
-        plugin_path = os.path.join(PLUGINS_DIR, name, "commands.py")
+    for entry in entries:
+        name = entry.name
+        real_name = name.removeprefix(PLUGIN_DISABLED_PREFIX)
+        disabled = real_name != name
+        plugin_path = f"{entry.path}{os.sep}commands.py"
 
         if os.path.exists(plugin_path):
             plugins.append({
@@ -278,91 +347,247 @@ def toggle_plugin(plugin_name, enable=True):
     print(f"Plugin not found: {plugin_name}")
     return False
 
-def show_plugin_info(plugin_name):
-    """Show information from plugin's metadata.json"""
-    for prefix in ("", PLUGIN_DISABLED_PREFIX):
-        plugin_dir = os.path.join(PLUGINS_DIR, f"{prefix}{plugin_name}")
-        metadata_path = os.path.join(plugin_dir, "metadata.json")
+def show_plugin_info(plugin_name, disabled=None):
+    """Show information from plugin's metadata.json.
 
-        if os.path.exists(metadata_path):
-            try:
-                with open(metadata_path) as f:
-                    metadata = json.load(f)
+    Pass `disabled` when it's already known (e.g. from list_plugins) to only
+    look in that one directory.
+    """
+    if disabled is None:
+        prefixes = ("", PLUGIN_DISABLED_PREFIX)
+    else:
+        prefixes = (PLUGIN_DISABLED_PREFIX,) if disabled else ("",)
+
+    for prefix in prefixes:
+        metadata_path = os.path.join(PLUGINS_DIR, f"{prefix}{plugin_name}", "metadata.json")
+
+        try:
+            metadata = _load_json_cached(metadata_path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except json.JSONDecodeError:
+            print(f"Error: Invalid metadata.json in {plugin_name}")
+            return False
+        except Exception as e:
+            print(f"Error reading plugin: {str(e)}")
+            return False
 
-                print(f"\nPlugin: {plugin_name}")
-                print(f"Status: {'Disabled' if prefix else 'Enabled'}")
-                print("-" * 40)
+        if not isinstance(metadata, dict):
+            print(f"Error: Invalid metadata.json in {plugin_name}")
+            return False
 
-                for field in ["author", "version", "description", "license"]:
-                    if field in metadata:
-                        print(f"{field.capitalize():<12}: {metadata[field]}")
+        print(f"\nPlugin: {plugin_name}")
+        print(f"Status: {'Disabled' if prefix else 'Enabled'}")
+        print("-" * 40)
 
-                custom_fields = set(metadata.keys()) - {"author", "version", "description", "license"}
-                if custom_fields:
-                    print("\nAdditional Info:")
-                    for field in sorted(custom_fields):
-                        print(f"{field.capitalize():<12}: {metadata[field]}")
+        for field in ["author", "version", "description", "license"]:
+            if field in metadata:
+                print(f"{field.capitalize():<12}: {metadata[field]}")
 
-                return True
+        # "commands" is read by load_plugins, it isn't something to show users
+        custom_fields = set(metadata.keys()) - {"author", "version", "description", "license", "commands"}
+        if custom_fields:
+            print("\nAdditional Info:")
+            for field in sorted(custom_fields):
+                print(f"{field.capitalize():<12}: {metadata[field]}")
 
-            except json.JSONDecodeError:
-                print(f"Error: Invalid metadata.json in {plugin_name}")
-                return False
-            except Exception as e:
-                print(f"Error reading plugin: {str(e)}")
-                return False
+        return True
 
     print(f"Plugin not found: {plugin_name}")
     return False
 
-def load_config():
-    for path in CONFIG_PATHS:
+@lru_cache(maxsize=1)
+def get_config_paths():
+    """Local and global config locations, resolved on first use"""
+    return (
+        os.path.join(PRYZMA_PATH, "config.json"),
+        os.path.expanduser("~/.pryzma/config.json"),
+    )
+
+
+def json_loads(data):
+    """Parse JSON text or bytes, with orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to handle the stdlib exception.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Parsed JSON files: path -> (st_mtime_ns, data)
+_JSON_CACHE = {}
+
+
+def _load_json_cached(path):
+    """Parse the JSON file at `path`, reusing the last result while its mtime is unchanged.
+
+    An empty file parses as {}. Raises FileNotFoundError/json.JSONDecodeError
+    like open()/json.load() would.
+    """
+    with open(path, "rb") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        cached = _JSON_CACHE.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        data = f.read()
+
+    parsed = json_loads(data) if data.strip() else {}
+    _JSON_CACHE[path] = (mtime_ns, parsed)
+    return parsed
+
+
+def invalidate_json_cache(path):
+    """Forget cached contents of a JSON file this process just wrote"""
+    _JSON_CACHE.pop(path, None)
+    load_config.cache_clear()
+
+
+def write_file_atomic(path, data):
+    """Write the bytes `data` to `path`.
+
+    The data goes to a temp file next to `path` that is then renamed over it,
+    so readers never see a half-written file. A symlinked `path` is written
+    through to its target, and an existing file keeps its permissions.
+    """
+    import shutil
+
+    path = os.path.realpath(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
         if os.path.exists(path):
-            with open(path, "r") as f:
-                return json.load(f)
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
-    print(f"[config] No config file found at {CONFIG_PATHS[0]} or {CONFIG_PATHS[1]}")
+def write_json_atomic(path, data):
+    """Write `data` to `path` as indented JSON, atomically"""
+    write_file_atomic(path, json.dumps(data, indent=4).encode("utf-8"))
+    invalidate_json_cache(path)
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    for path in get_config_paths():
+        try:
+            return _load_json_cached(path)
+        except FileNotFoundError:
+            continue
+
+    local_path, global_path = get_config_paths()
+    print(f"[config] No config file found at {local_path} or {global_path}")
     return {}
 
 
+class InvalidProjectName(ValueError):
+    """Raised by resolve_project for names that would leave PROJECTS_PATH"""
+
+
 def resolve_project(name):
     if name == ".":
         project_path = os.getcwd()
-    else:
+    elif is_valid_project_name(name):
         project_path = os.path.join(PROJECTS_PATH, name)
+    else:
+        raise InvalidProjectName(name)
 
     display_name = os.path.basename(project_path)
     return project_path, display_name
 
 
+@lru_cache(maxsize=1)
+def python_executable():
+    """Interpreter to run Python scripts with.
+
+    In a Nuitka build sys.executable is the compiled manager itself, so use the
+    "python" config key or the first python3/python on PATH instead.
+    """
+    if "__compiled__" not in globals():
+        return sys.executable
+
+    import shutil
+
+    # execv needs a path, so a bare command name from the config is looked up too
+    configured = load_config().get("python")
+    if configured:
+        return shutil.which(configured) or configured
+    found = shutil.which("python3") or shutil.which("python")
+    if not found:
+        print("[error] No Python interpreter found; set one with 'config set python <path>'")
+        sys.exit(1)
+    return found
+
+
+def exec_python(args):
+    """Replace this process with `python *args`.
+
+    Windows has no real exec (os.execv returns to the shell straight away), so
+    there the script runs as a child and its exit code is passed on.
+    """
+    python = python_executable()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if os.name == "nt":
+        import subprocess
+        sys.exit(subprocess.call([python, *args]))
+    os.execv(python, [python, *args])
+
+
+def run_nuitka(source_path):
+    """Compile `source_path` with nuitka, started directly rather than through a shell"""
+    import subprocess
+
+    try:
+        return subprocess.call(["nuitka", source_path])
+    except FileNotFoundError:
+        print("[build] nuitka not found, install it with 'pip install nuitka'")
+        return None
+
+
+def is_valid_project_name(name):
+    """A project name must be a single path component inside PROJECTS_PATH."""
+    return bool(name) and "/" not in name and os.sep not in name and not name.startswith(".")
+
+
+# How `config set` turns command line strings into JSON values
+CONFIG_BOOL_VALUES = {"true": True, "false": False}
+CONFIG_NUMBER_PATTERN = re.compile(r"-?(?:\d+\.?\d*|\.\d+)")
+
+
 def set_config_value(key, value, use_global=False):
     """Set a configuration value in either local or global config"""
-    config_path = CONFIG_PATHS[1] if use_global else CONFIG_PATHS[0]
+    config_path = get_config_paths()[1 if use_global else 0]
 
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
 
     config = {}
-    if os.path.exists(config_path):
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except json.JSONDecodeError:
-            print(f"[config] Warning: Existing config at {config_path} is invalid")
+    try:
+        with open(config_path, 'rb') as f:
+            config = json_loads(f.read())
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        print(f"[config] Warning: Existing config at {config_path} is invalid")
 
-    if value.lower() == 'true':
-        value = True
-    elif value.lower() == 'false':
-        value = False
-    elif value.isdigit():
-        value = int(value)
-    elif value.replace('.', '', 1).isdigit():
-        value = float(value)
+    lowered = value.lower()
+    if lowered in CONFIG_BOOL_VALUES:
+        value = CONFIG_BOOL_VALUES[lowered]
+    elif CONFIG_NUMBER_PATTERN.fullmatch(value):
+        value = float(value) if "." in value else int(value)
 
     config[key] = value
 
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        write_json_atomic(config_path, config)
         print(f"[config] Set {key} = {value} in {'global' if use_global else 'local'} config")
         return True
     except Exception as e:
@@ -372,15 +597,11 @@ def set_config_value(key, value, use_global=False):
 
 def remove_config_key(key, use_global=False):
     """Remove a key from configuration"""
-    config_path = CONFIG_PATHS[1] if use_global else CONFIG_PATHS[0]
-
-    if not os.path.exists(config_path):
-        print(f"[config] No {'global' if use_global else 'local'} config file found")
-        return False
+    config_path = get_config_paths()[1 if use_global else 0]
 
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = json_loads(f.read())
 
         if key not in config:
             print(f"[config] Key '{key}' not found in config")
@@ -388,12 +609,14 @@ def remove_config_key(key, use_global=False):
 
         removed_value = config.pop(key)
 
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        write_json_atomic(config_path, config)
 
         print(f"[config] Removed '{key}' (was: {removed_value})")
         return True
 
+    except FileNotFoundError:
+        print(f"[config] No {'global' if use_global else 'local'} config file found")
+        return False
     except json.JSONDecodeError:
         print(f"[config] Error: Invalid JSON in config file")
         return False
@@ -403,14 +626,17 @@ def remove_config_key(key, use_global=False):
 
 
 def init_main_env():
-    for path in [VENVS_PATH, PROJECTS_PATH]:
-        if not os.path.exists(path):
+    for path in (VENVS_PATH, PROJECTS_PATH):
+        try:
             os.makedirs(path)
             print(f"[init] Created {path}")
-    config = load_config()
-    if not "pryzma_path" in config:
-        set_config_value("pryzma_path", os.path.abspath(os.path.dirname(__file__)))
-        set_config_value("pryzma_path", os.path.abspath(os.path.dirname(__file__)), True)
+        except FileExistsError:
+            pass
+    # Usually already set, which costs one cached read of the active config
+    if "pryzma_path" not in load_config():
+        set_config_value("pryzma_path", PRYZMA_PATH)
+        if "pryzma_path" not in load_global_config():
+            set_config_value("pryzma_path", PRYZMA_PATH, True)
 
 def create_project_structure(project_path, template_name, project_name):
     """Create project files based on template"""
@@ -418,33 +644,33 @@ def create_project_structure(project_path, template_name, project_name):
         print(f"[init] Unknown template '{template_name}'. Using 'basic' template.")
         template_name = "basic"
     
-    template = TEMPLATES[template_name]
+    description = TEMPLATES[template_name]["description"]
     
     print(f"[init] Creating project with '{template_name}' template")
-    print(f"[init] {template['description']}")
+    print(f"[init] {description}")
     
-    for rel_path, content in template["files"].items():
-        rel_path = rel_path.replace("{project_name}", project_name)
-        
-        if "{project_name}" in content:
-            content = content.replace("{project_name}", project_name)
-        
-        full_path = os.path.join(project_path, rel_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        
-        with open(full_path, "w") as f:
+    encoded_name = project_name.encode()
+    files = [
+        (project_name.join(path_parts), encoded_name.join(content_parts))
+        for path_parts, content_parts in COMPILED_TEMPLATE_FILES[template_name]
+    ]
+
+    # Create every directory once; sorted so parents come before children
+    directories = {os.path.dirname(os.path.join(project_path, rel_path)) for rel_path, _ in files}
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+
+    for rel_path, content in files:
+        with open(os.path.join(project_path, rel_path), "wb") as f:
             f.write(content)
         print(f"[init] Created {rel_path}")
 
-    lib_entry = "src/module.pryzma"
-    basic_entry = "main.pryzma"
-
     config = {
         "name": project_name,
         "type": template_name,
         "version": "1.0",
-        "entry_point": f"{lib_entry if template_name == "lib" else basic_entry}",
-        "description": TEMPLATES[template_name]["description"],
+        "entry_point": "src/module.pryzma" if template_name == "lib" else "main.pryzma",
+        "description": description,
     }
 
     config_path = os.path.join(project_path, "pryzma.json")
@@ -457,58 +683,74 @@ def init_project(name=None, interactive=False, template="basic", use_git=False,
     if interactive:
         print("[init] Interactive project creation:")
         name = input("Enter project name: ").strip()
-        print("Available templates:")
-        for tpl_name, tpl_info in TEMPLATES.items():
-            print(f"  {tpl_name}: {tpl_info['description']}")
+        sys.stdout.write("Available templates:\n" + TEMPLATE_MENU)
         template = input("Choose template (default: basic): ").strip() or "basic"
-        use_git = False if input("Use git? (y/n default yes):").strip() != "y" or "yes" else True
+        use_git = input("Use git? (y/n default yes):").strip().lower() in YES_ANSWERS
         if use_git:
-            create_gitignore = False if input("Create a .gitignore (y/n default: yes): ").strip() != "y" or "yes" else True
+            create_gitignore = input("Create a .gitignore (y/n default: yes): ").strip().lower() in YES_ANSWERS
 
     if not name:
         print("[init] Project name is required.")
         return
 
+    if not is_valid_project_name(name):
+        print(f"[init] Invalid project name '{name}'.")
+        return
+
     path = os.path.join(PROJECTS_PATH, name)
-    if os.path.exists(path):
+    try:
+        os.makedirs(path)
+    except FileExistsError:
         print(f"[init] Project '{name}' already exists.")
         return
 
-    os.makedirs(path)
     create_project_structure(path, template, name)
     print(f"[init] Created project '{name}' at {path}")
 
     if use_git:
+        import subprocess
         try:
             subprocess.run(["git", "init"], cwd=path, check=True)
             print(f"[init] Initialized empty Git repository in {path}")
 
             if create_gitignore:
                 gitignore_path = os.path.join(path, ".gitignore")
-                with open(gitignore_path, "w") as f:
-                    f.write(GITIGNORE_TEMPLATE.strip() + "\n")
+                with open(gitignore_path, "wb") as f:
+                    f.write(GITIGNORE_BYTES)
                 print(f"[init] Created .gitignore at {gitignore_path}")
 
         except Exception as e:
             print(f"[git] Failed to initialize Git repo: {e}")
 
-def remove_project(name):
+def remove_project(name, yes=False):
+    import shutil
+
     project_path, name = resolve_project(name)
 
-    if not os.path.exists(project_path):
+    # lstat so a dangling project symlink can still be removed
+    try:
+        st = os.lstat(project_path)
+    except FileNotFoundError:
         print(f"[remove] Project '{name}' does not exist.")
         return
 
-    is_symlink = os.path.islink(project_path)
+    is_symlink = stat.S_ISLNK(st.st_mode)
     original_path = None
 
     if is_symlink:
-        original_path = os.path.realpath(project_path)
+        original_path = os.readlink(project_path)
         message = f"[remove] Project '{name}' is a symlink to {original_path}\nDelete the symlink? (y/n): "
     else:
         message = f"[remove] Delete project '{name}' and all its contents? (y/n): "
 
-    confirm = input(message).lower()
+    if yes:
+        confirm = "y"
+    else:
+        try:
+            confirm = input(message).lower()
+        except EOFError:
+            print()
+            confirm = ""
     if confirm != 'y':
         print("[remove] Cancelled.")
         return
@@ -527,56 +769,58 @@ def remove_project(name):
 
 def list_projects(detailed=False):
     print("[list] Listing all projects...")
-    if not os.path.exists(PROJECTS_PATH):
+    try:
+        with os.scandir(PROJECTS_PATH) as entries:
+            projects = [(entry.name, entry.path) for entry in entries]
+    except FileNotFoundError:
         print("[list] No projects directory found.")
         return
 
-    projects = os.listdir(PROJECTS_PATH)
     if not projects:
         print("[list] No projects found.")
-    else:
-        for project in projects:
-            project_path = os.path.join(PROJECTS_PATH, project)
-            if detailed:
-                config_path = os.path.join(project_path, "pryzma.json")
-                if os.path.exists(config_path):
-                    try:
-                        with open(config_path) as f:
-                            config = json.load(f)
-                        print(f" - {project} (v{config.get('version', '?.?.?')})")
-                        print(f"   Type: {config.get('type', 'unknown')}")
-                        print(f"   Path: {project_path}")
-                        if "description" in config:
-                            print(f"   Description: {config['description']}")
-                        print()
-                        continue
-                    except json.JSONDecodeError:
-                        pass
-            print(f" - {project}")
+        return
+
+    # Collect the listing and write it out in one go
+    lines = []
+    for project, project_path in projects:
+        if detailed:
+            try:
+                config = _load_json_cached(os.path.join(project_path, "pryzma.json"))
+                lines.append(f" - {project} (v{config.get('version', '?.?.?')})")
+                lines.append(f"   Type: {config.get('type', 'unknown')}")
+                lines.append(f"   Path: {project_path}")
+                if "description" in config:
+                    lines.append(f"   Description: {config['description']}")
+                lines.append("")
+                continue
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+        lines.append(f" - {project}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def show_project_info(name):
     project_path, name = resolve_project(name)
 
-    if not os.path.exists(project_path):
-        print(f"[info] Project '{name}' does not exist.")
-        return
-
     config_path = os.path.join(project_path, "pryzma.json")
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-            print(f"Project: {name}")
-            print(f"Path: {project_path}")
-            print(f"Type: {config.get('type', 'unknown')}")
-            print(f"Version: {config.get('version', '?.?.?')}")
-            if "description" in config:
-                print(f"Description: {config['description']}")
-            if "entry_point" in config:
-                print(f"Entry point: {config['entry_point']}")
+    try:
+        config = _load_json_cached(config_path)
+        print(f"Project: {name}")
+        print(f"Path: {project_path}")
+        print(f"Type: {config.get('type', 'unknown')}")
+        print(f"Version: {config.get('version', '?.?.?')}")
+        if "description" in config:
+            print(f"Description: {config['description']}")
+        if "entry_point" in config:
+            print(f"Entry point: {config['entry_point']}")
+        return
+    except (FileNotFoundError, NotADirectoryError):
+        # Only look at the project dir once we know something is missing
+        if not os.path.isdir(project_path):
+            print(f"[info] Project '{name}' does not exist.")
             return
-        except json.JSONDecodeError:
-            pass
+    except json.JSONDecodeError:
+        pass
 
     print(f"Basic project: {name}")
     print(f"Path: {project_path}")
@@ -596,11 +840,11 @@ def add_project(path):
 
         symlink_path = os.path.join(PROJECTS_PATH, project_name)
 
-        if os.path.exists(symlink_path):
+        try:
+            os.symlink(abs_path, symlink_path)
+        except FileExistsError:
             print(f"[add] Project '{project_name}' already exists in projects directory")
             return False
-
-        os.symlink(abs_path, symlink_path)
         print(f"[add] Created symlink to project '{project_name}' at {symlink_path}")
         return True
 
@@ -613,49 +857,63 @@ def add_project(path):
 
 
 def get_project_entry_point(project_name):
+    """Return (entry_point, project_config), or (None, None) if the project can't be run"""
     project_path, project_name = resolve_project(project_name)
-
-    if not os.path.exists(project_path):
-        print(f"[run] Project '{project_name}' does not exist.")
-        return None
-
-    if os.path.islink(project_path):
-        project_path = os.path.realpath(project_path)
+    project_path = os.path.realpath(project_path)
 
     config_path = os.path.join(project_path, "pryzma.json")
-    if not os.path.exists(config_path):
-        print(f"[run] No .pryzma config found in project '{project_name}'")
-        return None
-
     try:
-        with open(config_path) as f:
-            config = json.load(f)
+        config = _load_json_cached(config_path)
         entry_point = config.get("entry_point")
         if not entry_point:
             print(f"[run] No entry_point defined in .pryzma config")
-            return None
-        return os.path.join(project_path, entry_point)
+            return None, None
+        return os.path.join(project_path, entry_point), config
+    except FileNotFoundError:
+        # Only look at the project dir once we know something is missing
+        if not os.path.isdir(project_path):
+            print(f"[run] Project '{project_name}' does not exist.")
+        else:
+            print(f"[run] No .pryzma config found in project '{project_name}'")
+        return None, None
     except json.JSONDecodeError:
         print(f"[run] Invalid .pryzma config file")
-        return None
+        return None, None
     except Exception as e:
         print(f"[run] Error reading .pryzma config: {e}")
-        return None
+        return None, None
+
+
+@lru_cache(maxsize=None)
+def load_interpreter_module(interpreter_path):
+    """Load Pryzma.py from `interpreter_path` without touching sys.path.
+
+    The module is loaded once per path and reused by later runs in the process.
+    """
+    import importlib.util
+
+    module_path = os.path.join(os.path.abspath(interpreter_path), "Pryzma.py")
+    spec = importlib.util.spec_from_file_location("Pryzma", module_path)
+    if spec is None:
+        raise ImportError(f"Cannot load interpreter from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(spec.name, None)
+        raise
+    return module
 
 
 def run_project(name, debug=False):
-    project_path, name = resolve_project(name)
+    entry_point, project_config = get_project_entry_point(name)
+    if not entry_point:
+        return False
 
-    config_path = os.path.join(project_path, "pryzma.json")
-    venv_path = None
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-                venv_path = config.get("venv")
-        except json.JSONDecodeError:
-            pass
+    _, name = resolve_project(name)
 
+    venv_path = project_config.get("venv")
     if venv_path and os.path.exists(venv_path):
         interpreter_path = venv_path
         print(f"[run] Using virtual environment at {venv_path}")
@@ -663,36 +921,27 @@ def run_project(name, debug=False):
         config = load_config()
         interpreter_path = config.get("interpreter_path", "Pryzma-programming-language")
 
-    entry_point = get_project_entry_point(name)
-    if not entry_point:
-        return False
-
     if not os.path.exists(entry_point):
         print(f"[run] Entry point '{entry_point}' not found")
         return False
 
     print(f"[run] Running project '{name}' entry point: {entry_point}")
 
-    original_path = sys.path.copy()
-
     try:
-        sys.path.append(os.path.abspath(interpreter_path))
+        interpreter_cls = load_interpreter_module(interpreter_path).PryzmaInterpreter
+    except Exception as e:
+        print(f"[error] Could not import Pryzma interpreter: {e}")
+        return False
 
-        try:
-            from Pryzma import PryzmaInterpreter
-            interpreter = PryzmaInterpreter()
-            if debug:
-                interpreter.debug_interpreter(interpreter, entry_point, True, None)
-            else:
-                interpreter.interpret_file(entry_point)
-        except ImportError as e:
-            print(f"[error] Could not import Pryzma interpreter: {e}")
-            return False
-        except Exception as e:
-            print(f"[error] Error running script: {e}")
-            return False
-    finally:
-        sys.path = original_path
+    try:
+        interpreter = interpreter_cls()
+        if debug:
+            interpreter.debug_interpreter(interpreter, entry_point, True, None)
+        else:
+            interpreter.interpret_file(entry_point)
+    except Exception as e:
+        print(f"[error] Error running script: {e}")
+        return False
 
     return True
 
@@ -709,24 +958,51 @@ def test_project(args):
         print(f"Error: Test script {test_script} does not exist")
         sys.exit(1)
 
+    # The test run is the last thing this command does, hand the process over
     os.chdir(project_path)
-    os.system(f"python {test_script}")
+    exec_python([test_script])
+
+EMBEDDED_RUNNER_MAIN = """
+
+
+if __name__ == "__main__":
+    interpreter = PryzmaInterpreter()
+    interpreter.file_path = "<embedded>"
+    interpreter.variables["__file__"] = "<embedded>"
+    interpreter.pre_interpret(EMBEDDED_SOURCE)
+    """
+
+
+def write_generated_runner(out_name, bundled_source):
+    """Write minimal.py followed by the embedded source and its __main__ block.
+
+    Each piece goes straight to the file instead of being joined into one
+    string first, so the bundle is only held once (plus its repr).
+    """
+    import shutil
+
+    with open(MINIMAL_TEMPLATE_PATH) as template, open(out_name, "w") as out_file:
+        shutil.copyfileobj(template, out_file)
+        out_file.write("\nEMBEDDED_SOURCE = ")
+        out_file.write(repr(bundled_source))
+        out_file.write(EMBEDDED_RUNNER_MAIN)
+
 
 def build_project(args):
-    project_path, name = resolve_project(args.proj_name)
+    import shutil
 
-    if not os.path.exists(project_path):
-        print(f"Error: Project directory {project_path} does not exist")
-        sys.exit(1)
+    project_path, name = resolve_project(args.proj_name)
 
     project_config = os.path.join(project_path, "pryzma.json")
-    if not os.path.exists(project_config):
-        print(f"[build] Missing pryzma.json in {project_path}")
+    try:
+        content = _load_json_cached(project_config)
+    except (FileNotFoundError, NotADirectoryError):
+        if not os.path.isdir(project_path):
+            print(f"Error: Project directory {project_path} does not exist")
+        else:
+            print(f"[build] Missing pryzma.json in {project_path}")
         sys.exit(1)
 
-    with open(project_config) as file:
-        content = json.load(file)
-
     entry_point = os.path.join(project_path, content["entry_point"])
     if not os.path.exists(entry_point):
         print(f"[build] Entry point '{entry_point}' does not exist")
@@ -790,7 +1066,7 @@ def build_project(args):
                 print(f"[build] Restored compiled artifacts from cache")
                 return
             # Otherwise run compilation
-            os.system(f"nuitka {out_name}")
+            run_nuitka(out_name)
             return
         except Exception as e:
             print(f"[build] Failed to reuse cache: {e}")
@@ -814,24 +1090,7 @@ def build_project(args):
     with open(manifest_path, "w", encoding="utf-8") as manifest_file:
         json.dump(manifest_payload, manifest_file, indent=4)
 
-    with open(os.path.join(os.path.dirname(__file__), "minimal.py")) as file:
-        py_template = file.read()
-
-    runner = f"""
-EMBEDDED_SOURCE = {bundled_source!r}
-
-
-if __name__ == "__main__":
-    interpreter = PryzmaInterpreter()
-    interpreter.file_path = "<embedded>"
-    interpreter.variables["__file__"] = "<embedded>"
-    interpreter.pre_interpret(EMBEDDED_SOURCE)
-    """
-
-    build = py_template + runner
-
-    with open(out_name, "w") as out_file:
-        out_file.write(build)
+    write_generated_runner(out_name, bundled_source)
 
     print(f"Generated Python written to: {out_name}")
 
@@ -852,10 +1111,12 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"[build] Warning: failed to write cache: {e}")
 
-    os.system(f"nuitka {out_name}")
+    run_nuitka(out_name)
 
 
 def build_file(file_path, auto_fetch=False, no_cache=False):
+    import shutil
+
     entry_point = os.path.abspath(file_path)
 
     if not os.path.exists(entry_point):
@@ -921,7 +1182,7 @@ def build_file(file_path, auto_fetch=False, no_cache=False):
                 print(f"[build] Restored compiled artifacts from cache")
                 return
             # Otherwise run compilation
-            os.system(f"nuitka {out_name}")
+            run_nuitka(out_name)
             return
         except Exception as e:
             print(f"[build] Failed to reuse cache: {e}")
@@ -945,29 +1206,12 @@ def build_file(file_path, auto_fetch=False, no_cache=False):
     with open(manifest_path, "w", encoding="utf-8") as manifest_file:
         json.dump(manifest_payload, manifest_file, indent=4)
 
-    with open(os.path.join(os.path.dirname(__file__), "minimal.py")) as file:
-        py_template = file.read()
-
-    runner = f"""
-EMBEDDED_SOURCE = {bundled_source!r}
-
-
-if __name__ == "__main__":
-    interpreter = PryzmaInterpreter()
-    interpreter.file_path = "<embedded>"
-    interpreter.variables["__file__"] = "<embedded>"
-    interpreter.pre_interpret(EMBEDDED_SOURCE)
-    """
-
-    build = py_template + runner
-
-    with open(out_name, "w") as out_file:
-        out_file.write(build)
+    write_generated_runner(out_name, bundled_source)
 
     print(f"Generated Python written to: {out_name}")
     # Compile the generated python. After successful compilation, cache generated
     # python and any produced artifacts (best-effort).
-    os.system(f"nuitka {out_name}")
+    run_nuitka(out_name)
 
     try:
         if not no_cache:
@@ -989,23 +1233,39 @@ def install_dependencies(project_name):
 
     requirements_file = os.path.join(project_path, "requirements.txt")
 
-    if not os.path.exists(requirements_file):
-        print(f"[install] No requirements.txt found in project '{project_name}'")
-        return False
-
     try:
-        with open(requirements_file, 'r') as f:
-            packages = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        try:
+            with open(requirements_file, 'r') as f:
+                packages = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except FileNotFoundError:
+            print(f"[install] No requirements.txt found in project '{project_name}'")
+            return False
 
         if not packages:
             print(f"[install] No dependencies found in requirements.txt")
             return True
 
+        # The same package listed twice must not be installed concurrently
+        packages = list(dict.fromkeys(packages))
         print(f"[install] Installing {len(packages)} dependencies for '{project_name}'...")
 
+        # Don't spin up download workers for what is already there
+        missing = []
         for package in packages:
-            print(f"[install] Installing {package}...")
-            ppm_install(package)
+            if os.path.exists(os.path.join(PACKAGES_DIR, package)):
+                print(f"[install] {package} is already installed")
+            else:
+                missing.append(package)
+
+        def _install(package, log):
+            log(f"[install] Installing {package}...")
+            return ppm_install(package, log=log)
+
+        results = ppm_run_parallel(_install, missing)
+        failed = [package for package in missing if not results.get(package)]
+        if failed:
+            print(f"[install] Failed to install: {', '.join(failed)}")
+            return False
 
         print("[install] Dependency installation complete")
         return True
@@ -1053,11 +1313,26 @@ def _sanitize_reference_fragment(fragment):
 FUNCTION_DEF_PATTERN = re.compile(r'^/([^\s{]+)', re.MULTILINE)
 
 
+# Directives found per source file: path -> (st_mtime_ns, directives)
+_DIRECTIVES_CACHE = {}
+
+
 def parse_pryzma_directives(file_path):
+    """Return the `use`/`#insert` directives in a file.
+
+    Results are reused while the file's mtime is unchanged, so resolving the
+    same tree again (e.g. after build --auto-fetch installs packages) only
+    rescans files that changed.
+    """
     directives = []
 
     try:
         with open(file_path, "r", encoding="utf-8") as source:
+            mtime_ns = os.fstat(source.fileno()).st_mtime_ns
+            cached = _DIRECTIVES_CACHE.get(file_path)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+
             for idx, raw_line in enumerate(source, start=1):
                 stripped = raw_line.strip()
                 if not stripped:
@@ -1076,8 +1351,9 @@ def parse_pryzma_directives(file_path):
                     if fragment:
                         directives.append({"type": "use", "target": fragment, "line": idx})
     except FileNotFoundError:
-        pass
+        return directives
 
+    _DIRECTIVES_CACHE[file_path] = (mtime_ns, directives)
     return directives
 
 
@@ -1350,7 +1626,9 @@ def resolve_pryzma_dependencies(entry_path, project_root):
         "missing": missing,
         "cycles": cycles,
     }
-def venv_command(action, name=None, project_name=None):
+def venv_command(action, name=None, project_name=None, yes=False):
+    import shutil
+
     if action == "create":
         if not name:
             print("[venv] Please provide a name for the virtual environment.")
@@ -1371,9 +1649,9 @@ def venv_command(action, name=None, project_name=None):
         os.makedirs(target_path, exist_ok=True)
 
         if os.path.isdir(interpreter_path):
-            shutil.copy(os.path.join(interpreter_path, "Pryzma.py"), target_path)
+            clone_file(os.path.join(interpreter_path, "Pryzma.py"), target_path)
         else:
-            shutil.copy(interpreter_path, target_path)
+            clone_file(interpreter_path, target_path)
 
         print(f"[venv] Created virtual environment '{name}' in '{target_path}'.")
 
@@ -1382,7 +1660,8 @@ def venv_command(action, name=None, project_name=None):
             print("[venv] No virtual environments found.")
             return
 
-        envs = [d for d in os.listdir(VENVS_PATH) if os.path.isdir(os.path.join(VENVS_PATH, d))]
+        with os.scandir(VENVS_PATH) as entries:
+            envs = [entry.name for entry in entries if entry.is_dir()]
         if not envs:
             print("[venv] No virtual environments available.")
         else:
@@ -1392,14 +1671,26 @@ def venv_command(action, name=None, project_name=None):
     elif action == "remove":
         path = os.path.join(VENVS_PATH, name)
 
-        if not os.path.exists(path):
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
             print(f"[venv] Venv '{name}' does not exist.")
             return
 
-        confirm = input(f"[venv] Delete venv '{name}'? (y/n): ").lower()
+        if yes:
+            confirm = "y"
+        else:
+            try:
+                confirm = input(f"[venv] Delete venv '{name}'? (y/n): ").lower()
+            except EOFError:
+                print()
+                confirm = ""
         if confirm == "y":
             try:
-                shutil.rmtree(path)
+                if stat.S_ISLNK(st.st_mode):
+                    os.unlink(path)
+                else:
+                    shutil.rmtree(path)
                 print(f"[venv] Venv '{name}' has been deleted.")
             except Exception as e:
                 print(f"[error] Failed to delete project: {e}")
@@ -1410,15 +1701,39 @@ def venv_command(action, name=None, project_name=None):
     elif action == "unlink":
         venv_unlink_project(name)
     elif action == "run":
-        print("[venv] Launching Pryzma interpreter...")
-        sys.path.append(os.path.abspath(os.path.join(VENVS_PATH, name)))
+        print("[venv] Launching Pryzma interpreter...", flush=True)
 
         try:
-            os.system("python " + os.path.join(os.path.join(VENVS_PATH, name), "Pryzma.py"))
-        except Exception as e:
+            exec_python([os.path.join(VENVS_PATH, name, "Pryzma.py")])
+        except OSError as e:
             print(f"[error] Error launching interpreter: {e}")
 
 
+# ioctl request for a copy-on-write clone (Linux btrfs/XFS and friends)
+FICLONE = 0x40049409
+
+
+def clone_file(src, dst):
+    """Copy src into dst (file or directory), sharing blocks via a reflink when the filesystem can.
+
+    A hard link would be cheaper still, but then editing a venv's Pryzma.py
+    would edit the interpreter it was created from.
+    """
+    import shutil
+
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    try:
+        import fcntl
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        shutil.copystat(src, dst)
+        return dst
+    except (ImportError, OSError):
+        pass
+    return shutil.copy2(src, dst)
+
+
 def venv_link_project(venv_name, project_name):
     venv_path = os.path.join(VENVS_PATH, venv_name)
     project_path, project_name = resolve_project(project_name)
@@ -1427,24 +1742,23 @@ def venv_link_project(venv_name, project_name):
         print(f"[venv] Virtual environment '{venv_name}' does not exist")
         return False
 
-    if not os.path.exists(project_path):
-        print(f"[venv] Project '{project_name}' does not exist")
-        return False
-
     config_path = os.path.join(project_path, "pryzma.json")
     config = {}
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-        except json.JSONDecodeError:
-            print("[venv] Warning: Could not parse existing .pryzma config")
+    try:
+        with open(config_path, "rb") as f:
+            config = json_loads(f.read())
+    except (FileNotFoundError, NotADirectoryError):
+        # Only look at the project dir once we know something is missing
+        if not os.path.isdir(project_path):
+            print(f"[venv] Project '{project_name}' does not exist")
+            return False
+    except json.JSONDecodeError:
+        print("[venv] Warning: Could not parse existing .pryzma config")
 
     config["venv"] = venv_path
 
     try:
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=4)
+        write_json_atomic(config_path, config)
         print(f"[venv] Linked virtual environment '{venv_name}' to project '{project_name}'")
         return True
     except Exception as e:
@@ -1455,24 +1769,23 @@ def venv_link_project(venv_name, project_name):
 def venv_unlink_project(project_name):
     project_path, project_name = resolve_project(project_name)
 
-    if not os.path.exists(project_path):
-        print(f"[venv] Project '{project_name}' does not exist")
-        return False
-
     config_path = os.path.join(project_path, "pryzma.json")
     config = {}
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-        except json.JSONDecodeError:
-            print("[venv] Warning: Could not parse existing .pryzma config")
+    try:
+        with open(config_path, "rb") as f:
+            config = json_loads(f.read())
+    except (FileNotFoundError, NotADirectoryError):
+        # Only look at the project dir once we know something is missing
+        if not os.path.isdir(project_path):
+            print(f"[venv] Project '{project_name}' does not exist")
+            return False
+    except json.JSONDecodeError:
+        print("[venv] Warning: Could not parse existing .pryzma config")
 
     config["venv"] = None
 
     try:
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=4)
+        write_json_atomic(config_path, config)
         print(f"[venv] Unlinked virtual environment from project '{project_name}'")
         return True
     except Exception as e:
@@ -1490,11 +1803,9 @@ def run_script(path=None, debug=False):
 
     if path:
         print(f"[run] Running Pryzma script at '{path}'...")
-        sys.path.append(os.path.abspath(interpreter_path))
 
         try:
-            from Pryzma import PryzmaInterpreter
-            interpreter = PryzmaInterpreter()
+            interpreter = load_interpreter_module(interpreter_path).PryzmaInterpreter()
             if debug:
                 interpreter.debug_interpreter(interpreter, path, True, None)
             else:
@@ -1504,12 +1815,12 @@ def run_script(path=None, debug=False):
         except Exception as e:
             print(f"[error] Error running script: {e}")
     else:
-        print("[run] Launching Pryzma interpreter...")
-        sys.path.append(os.path.abspath(interpreter_path))
+        print("[run] Launching Pryzma interpreter...", flush=True)
 
+        # Nothing left to do here once the REPL exits, so hand the process over
         try:
-            os.system("python " + os.path.join(interpreter_path, "Pryzma.py"))
-        except Exception as e:
+            exec_python([os.path.join(interpreter_path, "Pryzma.py")])
+        except OSError as e:
             print(f"[error] Error launching interpreter: {e}")
 
 
@@ -1521,23 +1832,152 @@ def compile_script(path):
         print(f"[run] Compiler not found at '{interpreter_path}'")
         return
 
-    print("[run] Launching Pryzma compiler...")
-    sys.path.append(os.path.abspath(interpreter_path))
+    print("[run] Launching Pryzma compiler...", flush=True)
+
+    argv = [os.path.join(interpreter_path, "Pryzmac.py")]
+    if path:
+        argv.append(path)
 
     try:
-        os.system("python " + os.path.join(interpreter_path, "Pryzmac.py") + " " + path)
-    except Exception as e:
+        exec_python(argv)
+    except OSError as e:
         print(f"[error] Error launching compiler: {e}")
 
 
 
-def ppm_install(package_name):
-    os.makedirs(PACKAGES_DIR, exist_ok=True)
+PPM_MAX_WORKERS = 8
+
+# ppm update parks the old copy of a package as <name>.<pid>.old until the new
+# one is installed; a crash mid-update can leave one behind, listings skip them
+PPM_BACKUP_SUFFIX = ".old"
+
+# The GitHub fallback extracts into a .ppm_<name>_* staging dir in PACKAGES_DIR,
+# a killed download can leave one behind
+PPM_STAGING_PREFIX = ".ppm_"
+
+
+def is_package_dir_entry(entry, follow_symlinks=True):
+    """Whether a PACKAGES_DIR scandir entry is an installed package"""
+    name = entry.name
+    return (entry.is_dir(follow_symlinks=follow_symlinks)
+            and not name.endswith(PPM_BACKUP_SUFFIX)
+            and not name.startswith(PPM_STAGING_PREFIX))
+
+
+def is_safe_tar_member(member):
+    """Only plain files and dirs with a relative path that stays inside the target"""
+    if not (member.isreg() or member.isdir()):
+        return False
+    name = member.name.replace("\\", "/")
+    if name.startswith("/") or os.path.isabs(name) or os.path.splitdrive(name)[0]:
+        return False
+    return ".." not in name.split("/")
+
+
+@lru_cache(maxsize=1)
+def get_http_session():
+    """Keep-alive session shared by all ppm HTTP requests"""
+    import requests
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Retry transient server errors with backoff; dead hosts only get one more
+    # connect attempt so falling through the mirror list stays quick
+    retries = Retry(total=3, connect=1, backoff_factor=0.3,
+                    status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=PPM_MAX_WORKERS, pool_maxsize=2 * PPM_MAX_WORKERS,
+                                            max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_package_archive(url, package_path, log=print, timeout=10):
+    """Stream a zipped package from `url` and extract it into `package_path`.
+
+    The archive is spooled to a temporary file (in memory while small) instead
+    of being held in RAM as one response body.
+    """
+    import shutil
+    import tempfile
+    import zipfile
+    with get_http_session().get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        # Read straight off the socket, still undoing any gzip transfer encoding
+        response.raw.decode_content = True
+        with tempfile.SpooledTemporaryFile(max_size=8 << 20) as archive:
+            shutil.copyfileobj(response.raw, archive, 1 << 16)
+            archive.seek(0)
+
+            log("Download succeeded. Extracting package...")
+            with zipfile.ZipFile(archive) as zip_ref:
+                zip_ref.extractall(package_path)
+
+
+PPM_GITHUB_ARCHIVE_URL = "https://github.com/IgorCielniak/Pryzma-packages/archive/HEAD.tar.gz"
+
+
+def download_package_from_github(package_name, package_path, timeout=30):
+    """Fetch a single package folder out of the Pryzma-packages repo tarball.
+
+    The archive is read as a stream and only members under `<package_name>/`
+    are extracted, into a staging dir next to `package_path` that is renamed
+    into place once complete.
+    """
+    import shutil
+    import tarfile
+    import tempfile
+
+    staging_dir = tempfile.mkdtemp(prefix=f"{PPM_STAGING_PREFIX}{package_name}_", dir=os.path.dirname(package_path))
+    try:
+        with get_http_session().get(PPM_GITHUB_ARCHIVE_URL, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            found = False
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    # Members are "<repo>-<ref>/<package>/..."; drop the top-level dir
+                    _, _, relative = member.name.partition("/")
+                    if relative != package_name and not relative.startswith(f"{package_name}/"):
+                        # git archives list a directory's entries together, so
+                        # once past the package there's no need to read on
+                        if found:
+                            break
+                        continue
+                    member.name = relative
+                    if hasattr(tarfile, "data_filter"):
+                        archive.extract(member, staging_dir, filter="data")
+                    elif is_safe_tar_member(member):
+                        # No extraction filters on this Python, so links,
+                        # devices and paths escaping staging_dir are skipped here
+                        archive.extract(member, staging_dir)
+                    else:
+                        continue
+                    found = True
+
+        package_folder = os.path.join(staging_dir, package_name)
+        if not found or not os.path.isdir(package_folder):
+            raise FileNotFoundError(f"Package '{package_name}' not found in GitHub repo.")
+
+        os.rename(package_folder, package_path)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path):
+    """makedirs(path, exist_ok=True), done at most once per path per run"""
+    os.makedirs(path, exist_ok=True)
+
+
+def ppm_install(package_name, log=print):
+    ensure_dir(PACKAGES_DIR)
     package_path = os.path.join(PACKAGES_DIR, package_name)
 
     if os.path.exists(package_path):
-        print(f"Package '{package_name}' is already installed.")
-        return
+        log(f"Package '{package_name}' is already installed.")
+        return True
 
     # === MIRRORS / PRIMARY SOURCES ===
     # Mirrors can be configured in the user's local config under the key 'ppm_mirrors'
@@ -1566,14 +2006,15 @@ def ppm_install(package_name):
             url = f"{base}/download/{package_name}"
             targets.append((m, url))
 
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
         results = []
         workers = min(max_workers, len(targets))
 
         def _probe(url, mirror):
-            s = requests.Session()
             t0 = time.time()
             try:
-                r = s.head(url, timeout=timeout, allow_redirects=True)
+                r = get_http_session().head(url, timeout=timeout, allow_redirects=True)
                 elapsed = time.time() - t0
                 return (mirror, True, elapsed, r.status_code)
             except Exception as e:
@@ -1594,7 +2035,7 @@ def ppm_install(package_name):
         return [m for _, m in results]
 
     mirrors = get_ppm_mirrors()
-    print(f"[ppm] Using {len(mirrors)} mirror(s)")
+    log(f"[ppm] Using {len(mirrors)} mirror(s)")
 
     # Probe mirrors to find reachable ones ordered by latency
     ordered_mirrors = choose_mirrors_by_latency(mirrors, package_name)
@@ -1603,136 +2044,176 @@ def ppm_install(package_name):
     for mirror in ordered_mirrors:
         tried_any = True
         primary_url = mirror.rstrip('/') + f"/download/{package_name}"
-        print(f"Trying to download {package_name} from {primary_url}...")
+        log(f"Trying to download {package_name} from {primary_url}...")
         try:
-            response = requests.get(primary_url, timeout=10)
-            response.raise_for_status()
-
-            print("Download succeeded. Extracting package...")
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                zip_ref.extractall(package_path)
-            print(f"{package_name} installed successfully from {mirror}.")
-            return
+            download_package_archive(primary_url, package_path, log)
+            log(f"{package_name} installed successfully from {mirror}.")
+            return True
         except Exception as e:
-            print(f"Mirror {mirror} failed: {e}")
+            log(f"Mirror {mirror} failed: {e}")
 
     # If we probed mirrors but none returned 200 on HEAD, fall back to trying mirrors in provided order
     if not tried_any and mirrors:
         for mirror in mirrors:
             primary_url = mirror.rstrip('/') + f"/download/{package_name}"
-            print(f"Trying to download {package_name} from {primary_url} (fallback order)...")
+            log(f"Trying to download {package_name} from {primary_url} (fallback order)...")
             try:
-                response = requests.get(primary_url, timeout=10)
-                response.raise_for_status()
-
-                print("Download succeeded. Extracting package...")
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                    zip_ref.extractall(package_path)
-                print(f"{package_name} installed successfully from {mirror}.")
-                return
+                download_package_archive(primary_url, package_path, log)
+                log(f"{package_name} installed successfully from {mirror}.")
+                return True
             except Exception as e:
-                print(f"Mirror {mirror} failed: {e}")
+                log(f"Mirror {mirror} failed: {e}")
 
     # === FALLBACK SOURCE ===
-    print("Trying fallback source (GitHub)...")
-
-    github_repo_url = "https://github.com/IgorCielniak/Pryzma-packages"
-    clone_dir = os.path.join("/tmp", f"ppm_temp_{package_name}")
+    log("Trying fallback source (GitHub)...")
 
     try:
-        subprocess.run(["git", "clone", "--depth=1", github_repo_url, clone_dir], check=True)
+        download_package_from_github(package_name, package_path)
+        log(f"{package_name} installed successfully from GitHub.")
+        return True
+    except Exception as e:
+        log(f"Fallback source failed: {e}")
+        log("Package installation failed from all sources.")
+        return False
 
-        package_folder = os.path.join(clone_dir, package_name)
-        if not os.path.isdir(package_folder):
-            raise FileNotFoundError(f"Package '{package_name}' not found in GitHub repo.")
 
-        shutil.copytree(package_folder, package_path)
-        print(f"{package_name} installed successfully from GitHub.")
-    except Exception as e:
-        print(f"Fallback source failed: {e}")
-        print("Package installation failed from all sources.")
-    finally:
-        if os.path.exists(clone_dir):
-            shutil.rmtree(clone_dir)
+def ppm_run_parallel(action, package_names):
+    """Run action(name, log=...) for every package on a thread pool.
 
+    Each package's output is buffered and printed as one block when it
+    finishes so concurrent downloads don't interleave. Returns {name: result}.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def ppm_list():
-    if not os.path.isdir(PACKAGES_DIR):
-        print("No packages installed.")
-        return
+    results = {}
+    if not package_names:
+        return results
 
-    packages = os.listdir(PACKAGES_DIR)
+    def _run(name):
+        lines = []
+        try:
+            result = action(name, log=lines.append)
+        except Exception as e:
+            lines.append(f"[ppm] {name} failed: {e}")
+            result = False
+        return name, result, lines
+
+    with ThreadPoolExecutor(max_workers=min(PPM_MAX_WORKERS, len(package_names))) as ex:
+        futures = [ex.submit(_run, name) for name in package_names]
+        for fut in as_completed(futures):
+            name, result, lines = fut.result()
+            print("\n".join(lines))
+            results[name] = result
+
+    return results
+
+
+def ppm_list():
+    try:
+        with os.scandir(PACKAGES_DIR) as entries:
+            packages = [entry.name for entry in entries if is_package_dir_entry(entry)]
+    except (FileNotFoundError, NotADirectoryError):
+        packages = []
     if not packages:
         print("No packages installed.")
         return
 
-    print("Installed packages:")
-    for pkg in packages:
-        print(f"- {pkg}")
+    sys.stdout.write("Installed packages:\n" + "".join(f"- {pkg}\n" for pkg in packages))
 
 
 def ppm_remove(package_name):
+    import shutil
+
     package_path = os.path.join(PACKAGES_DIR, package_name)
 
-    if os.path.isdir(package_path):
+    try:
+        st = os.lstat(package_path)
+    except FileNotFoundError:
+        print(f"Package '{package_name}' not found.")
+        return
+
+    if stat.S_ISLNK(st.st_mode):
+        os.unlink(package_path)
+    elif stat.S_ISDIR(st.st_mode):
         shutil.rmtree(package_path)
-        print(f"Package '{package_name}' removed.")
     else:
         print(f"Package '{package_name}' not found.")
+        return
+    print(f"Package '{package_name}' removed.")
 
 
 def ppm_info(package_name):
     metadata_path = os.path.join(PACKAGES_DIR, package_name, "metadata.json")
 
-    if not os.path.isfile(metadata_path):
-        print(f"No metadata found for package '{package_name}'.")
-        return
-
     try:
-        with open(metadata_path, "r") as f:
-            data = json.load(f)
+        data = _load_json_cached(metadata_path)
 
         print("Package Info:")
         for key, value in data.items():
             print(f"{key.capitalize()}: {value}")
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        print(f"No metadata found for package '{package_name}'.")
     except Exception as e:
         print(f"Error reading metadata: {e}")
 
-def ppm_update_package(package_name):
-    print(f"Updating {package_name}...")
-    shutil.rmtree(os.path.join(PACKAGES_DIR, package_name))
-    ppm_install(package_name)
-    print(f"Updated {package_name} successfully.\n")
+def ppm_update_package(package_name, log=print):
+    import shutil
+
+    package_path = os.path.join(PACKAGES_DIR, package_name)
+    if not os.path.isdir(package_path):
+        log(f"Package '{package_name}' not found.")
+        return False
+
+    log(f"Updating {package_name}...")
+    # Move the old copy aside with one rename; it's only deleted once the
+    # new one is in place, and restored if the reinstall fails
+    old_path = f"{package_path}.{os.getpid()}{PPM_BACKUP_SUFFIX}"
+    os.rename(package_path, old_path)
+
+    def restore():
+        # A failed install can leave a partial copy behind
+        if os.path.lexists(package_path):
+            if os.path.isdir(package_path) and not os.path.islink(package_path):
+                shutil.rmtree(package_path, ignore_errors=True)
+            else:
+                os.unlink(package_path)
+        os.rename(old_path, package_path)
+
+    try:
+        ok = ppm_install(package_name, log=log)
+    except BaseException:
+        restore()
+        raise
+
+    if ok:
+        shutil.rmtree(old_path, ignore_errors=True)
+        log(f"Updated {package_name} successfully.\n")
+    else:
+        restore()
+        log(f"Update of {package_name} failed, kept the installed version.\n")
+    return ok
 
 def ppm_update_all():
-    if not Path(PACKAGES_DIR).exists():
+    try:
+        with os.scandir(PACKAGES_DIR) as entries:
+            packages = [entry.name for entry in entries if is_package_dir_entry(entry, follow_symlinks=False)]
+    except FileNotFoundError:
+        packages = []
+    if not packages:
         print("No packages installed.")
         return
-    
-    for pkg in Path(PACKAGES_DIR).iterdir():
-        if pkg.is_dir():
-            ppm_update_package(pkg.name)
+
+    ppm_run_parallel(ppm_update_package, packages)
 
 
 ### Local config helpers ###
 def load_local_config():
     # Prefer local config; if it doesn't exist, fall back to global config
-    local_path = CONFIG_PATHS[0]
-    global_path = CONFIG_PATHS[1] if len(CONFIG_PATHS) > 1 else None
-
-    # Try local first
-    if os.path.exists(local_path):
-        try:
-            with open(local_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    # Fallback to global if present
-    if global_path and os.path.exists(global_path):
+    for path in get_config_paths():
         try:
-            with open(global_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_json_cached(path)
+        except FileNotFoundError:
+            continue
         except Exception:
             return {}
 
@@ -1740,76 +2221,54 @@ def load_local_config():
 
 def save_used_config(cfg):
     """Save cfg to the config file that would be used by load_local_config():
-    prefer local CONFIG_PATHS[0] if it exists, otherwise use global CONFIG_PATHS[1].
+    prefer local get_config_paths()[0] if it exists, otherwise use global get_config_paths()[1].
     Creates parent dirs and writes atomically.
     """
     # determine the active config path (first existing or local default)
     target = get_active_config_path()
 
     os.makedirs(os.path.dirname(target), exist_ok=True)
-    import tempfile
     try:
-        with tempfile.NamedTemporaryFile('w', delete=False, dir=os.path.dirname(target), encoding='utf-8') as tf:
-            json.dump(cfg, tf, indent=4)
-            tmpname = tf.name
-        os.replace(tmpname, target)
+        write_json_atomic(target, cfg)
         return True
     except Exception as e:
         print(f"[config] Failed to write config to {target}: {e}")
-        try:
-            if 'tmpname' in locals() and os.path.exists(tmpname):
-                os.remove(tmpname)
-        except Exception:
-            pass
         return False
 
 
 def get_active_config_path():
-    """Return the config path that load_config() would use (first existing in CONFIG_PATHS),
-    or the local path (CONFIG_PATHS[0]) if none exist.
+    """Return the config path that load_config() would use (first existing in get_config_paths()),
+    or the local path (get_config_paths()[0]) if none exist.
     """
-    for path in CONFIG_PATHS:
+    for path in get_config_paths():
         if os.path.exists(path):
             return path
-    return CONFIG_PATHS[0]
+    return get_config_paths()[0]
 
 
 def load_global_config():
-    """Load only the global config file (CONFIG_PATHS[1]) and return a dict."""
-    if len(CONFIG_PATHS) < 2:
-        return {}
-    cfg_path = CONFIG_PATHS[1]
-    if not os.path.exists(cfg_path):
+    """Load only the global config file (get_config_paths()[1]) and return a dict."""
+    if len(get_config_paths()) < 2:
         return {}
     try:
-        with open(cfg_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _load_json_cached(get_config_paths()[1])
     except Exception:
         return {}
 
 
 def save_config(cfg, use_global=False):
     """Save cfg to local (default) or global config depending on use_global flag. Atomic write."""
-    if use_global and len(CONFIG_PATHS) > 1:
-        target = CONFIG_PATHS[1]
+    if use_global and len(get_config_paths()) > 1:
+        target = get_config_paths()[1]
     else:
-        target = CONFIG_PATHS[0]
+        target = get_config_paths()[0]
 
     os.makedirs(os.path.dirname(target), exist_ok=True)
-    import tempfile
     try:
-        with tempfile.NamedTemporaryFile('w', delete=False, dir=os.path.dirname(target), encoding='utf-8') as tf:
-            json.dump(cfg, tf, indent=4)
-            tmpname = tf.name
-        os.replace(tmpname, target)
+        write_json_atomic(target, cfg)
         return True
     except Exception as e:
         print(f"[config] Failed to write config to {target}: {e}")
-        try:
-            if 'tmpname' in locals() and os.path.exists(tmpname):
-                os.remove(tmpname)
-        except Exception:
-            pass
         return False
 
 def ppm_mirrors_list(use_global=False):
@@ -1824,8 +2283,9 @@ def ppm_mirrors_list(use_global=False):
 
 
 def ppm_mirrors_add(url, use_global=False):
-    cfg = load_config() if not use_global else (load_global_config() if 'load_global_config' in globals() else {})
-    mirrors = cfg.get('ppm_mirrors', [])
+    # Copy, the loaded config is shared with the JSON cache
+    cfg = dict(load_config() if not use_global else (load_global_config() if 'load_global_config' in globals() else {}))
+    mirrors = list(cfg.get('ppm_mirrors', []))
     if url in mirrors:
         print("[mirrors] Mirror already exists in list")
         return False
@@ -1842,8 +2302,8 @@ def ppm_mirrors_add(url, use_global=False):
 
 
 def ppm_mirrors_remove(identifier, use_global=False):
-    cfg = load_config() if not use_global else (load_global_config() if 'load_global_config' in globals() else {})
-    mirrors = cfg.get('ppm_mirrors', [])
+    cfg = dict(load_config() if not use_global else (load_global_config() if 'load_global_config' in globals() else {}))
+    mirrors = list(cfg.get('ppm_mirrors', []))
     if not mirrors:
         print("[mirrors] No mirrors configured")
         return False
@@ -1889,7 +2349,7 @@ def ppm_mirrors_test(timeout=3, use_global=False):
     for m in mirrors:
         try:
             t0 = time.time()
-            r = requests.head(m, timeout=timeout, allow_redirects=True)
+            r = get_http_session().head(m, timeout=timeout, allow_redirects=True)
             elapsed = time.time() - t0
             status = r.status_code
             results.append((m, elapsed, status))
@@ -1904,63 +2364,65 @@ def ppm_mirrors_test(timeout=3, use_global=False):
             print(f" - {m}: {elapsed:.3f}s (HTTP {status})")
 
 
-def notes_list(proj_name):
-    proj_path = os.path.join(PROJECTS_PATH, proj_name)
-    if not os.path.exists(proj_path):
-        print(f"[notes] Project '{proj_name}' doesn't exist")
-        return
+def _notes_file(proj_name):
+    return os.path.join(resolve_project(proj_name)[0], "notes")
+
 
-    notes_file = os.path.join(PROJECTS_PATH, proj_name, "notes")
-    if not os.path.exists(notes_file):
+def _notes_missing(proj_name):
+    """Report why a project's notes file couldn't be opened"""
+    if not os.path.isdir(resolve_project(proj_name)[0]):
+        print(f"[notes] Project '{proj_name}' doesn't exist")
+    else:
         print(f"[notes] Notes file for project '{proj_name}' doesn't exist")
-        return
 
-    with open(notes_file) as f:
-        notes = f.read().splitlines()
 
-    notes = list(filter(None, map(str.strip, notes)))
+def notes_list(proj_name):
+    try:
+        with open(_notes_file(proj_name), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        _notes_missing(proj_name)
+        return
+
+    # Number the non-empty lines and decode the whole listing once
+    out = []
+    for ln in data.splitlines():
+        ln = ln.strip()
+        if ln:
+            out.append(b"[%d] %s\n" % (len(out) + 1, ln))
 
-    if len(notes) < 1:
+    if not out:
         print(f"[notes] No notes found for project '{proj_name}'.")
         return
 
-    print(f"Notes for project '{proj_name}':")
-
-    for i, note in enumerate(notes):
-        print(f"[{i+1}] {note}")
+    sys.stdout.write(f"Notes for project '{proj_name}':\n" + b"".join(out).decode(errors="replace"))
 
 def notes_remove(proj_name, line):
-    proj_path = os.path.join(PROJECTS_PATH, proj_name)
-    if not os.path.exists(proj_path):
-        print(f"[notes] Project '{proj_name}' doesn't exist")
-        return
-    notes_file = os.path.join(PROJECTS_PATH, proj_name, "notes")
-    if not os.path.exists(notes_file):
-        print(f"[notes] Notes file for project '{proj_name}' doesn't exist")
+    notes_file = _notes_file(proj_name)
+    try:
+        with open(notes_file, "rb") as f:
+            all_lines = f.read().splitlines(keepends=True)
+    except FileNotFoundError:
+        _notes_missing(proj_name)
         return
 
-    with open(notes_file) as f:
-        all_lines = f.read().splitlines()
-
-    non_empty_lines = [(i, ln) for i, ln in enumerate(all_lines) if ln.strip()]
+    non_empty_lines = [i for i, ln in enumerate(all_lines) if ln.strip()]
 
     try:
         line_num = int(line)
-        if line_num < 1 or line_num > len(non_empty_lines):
-            print(f"[notes] Invalid line number {line_num} (valid range: 1-{len(non_empty_lines)})")
-            return
-
-        original_index, note_to_remove = non_empty_lines[line_num-1]
-
-        all_lines.pop(original_index)
+    except ValueError:
+        print(f"[notes] Line number must be an integer, got '{line}'")
+        return
 
-        with open(notes_file, "w") as f:
-            f.write("\n".join(all_lines))
+    if line_num < 1 or line_num > len(non_empty_lines):
+        print(f"[notes] Invalid line number {line_num} (valid range: 1-{len(non_empty_lines)})")
+        return
 
-        print(f"[notes] Removed note: {note_to_remove}")
+    original_index = non_empty_lines[line_num-1]
+    note_to_remove = all_lines.pop(original_index).rstrip(b"\r\n").decode(errors="replace")
+    write_file_atomic(notes_file, b"".join(all_lines))
 
-    except ValueError:
-        print(f"[notes] Line number must be an integer, got '{line}'")
+    print(f"[notes] Removed note: {note_to_remove}")
 
 def ppm_fetch_and_print_packages(url = "http://pryzma.dzordz.pl/api/fetch"):
     import_err = False
@@ -1986,44 +2448,42 @@ def ppm_fetch_and_print_packages(url = "http://pryzma.dzordz.pl/api/fetch"):
             print("Error fetching packages:", e)
 
 def notes_add(proj_name, note):
-    proj_path = os.path.join(PROJECTS_PATH, proj_name)
-    if not os.path.exists(proj_path):
-        print(f"[notes] Project '{proj_name}' doesn't exist")
-        return
-    notes_file = os.path.join(PROJECTS_PATH, proj_name, "notes")
-    if not os.path.exists(notes_file):
-        print(f"[notes] Notes file for project '{proj_name}' doesn't exist")
+    notes_file = _notes_file(proj_name)
+    try:
+        # no O_CREAT, so a missing notes file fails here instead of being created
+        fd = os.open(notes_file, os.O_RDWR | os.O_APPEND)
+    except FileNotFoundError:
+        _notes_missing(proj_name)
         return
 
-    with open(notes_file) as f:
-        all_lines = f.read().splitlines()
-
-    all_lines.append(note)
-
-    with open(notes_file, "w") as f:
-        f.write("\n".join(all_lines))
+    try:
+        data = note.encode() + b"\n"
+        # older notes files were written without a trailing newline
+        if os.fstat(fd).st_size:
+            os.lseek(fd, -1, os.SEEK_END)
+            if os.read(fd, 1) != b"\n":
+                data = b"\n" + data
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
     print(f"[notes] Added note '{note}' to project '{proj_name}'")
 
 
-def build_parser():
-    parser = argparse.ArgumentParser(prog="pryzma-manager", description="Manage Pryzma projects and environments and more")
-    subparsers = parser.add_subparsers(dest="command")
-
-    # Project group
-    proj_parser = subparsers.add_parser("proj", help="Project management commands")
+def _build_proj(proj_parser):
     proj_subparsers = proj_parser.add_subparsers(dest="proj_command")
 
     proj_init = proj_subparsers.add_parser("init", help="Initialize a new Pryzma project")
     proj_init.add_argument("name", nargs="?", help="Project name")
     proj_init.add_argument("-i", "--interactive", action="store_true", help="Interactive mode")
-    proj_init.add_argument("-t", "--template", choices=list(TEMPLATES.keys()), default="basic",
+    proj_init.add_argument("-t", "--template", choices=TEMPLATE_NAMES, default="basic",
                           help="Project template to use")
     proj_init.add_argument("-g", "--git", action="store_true", help="Use git")
     proj_init.add_argument("-gi", "--git-ignore", action="store_true", help="Create a default .gitignore")
 
     proj_remove = proj_subparsers.add_parser("remove", help="Remove a project")
     proj_remove.add_argument("name", help="Project name")
+    proj_remove.add_argument("-y", "--yes", action="store_true", help="Don't ask for confirmation")
 
     proj_list = proj_subparsers.add_parser("list", help="List all Pryzma projects")
     proj_list.add_argument("-d", "--detailed", action="store_true", help="Show detailed project information")
@@ -2049,31 +2509,33 @@ def build_parser():
     proj_build.add_argument("-a", "--auto-fetch", action="store_true", dest="auto_fetch", help="Automatically fetch missing Pryzma package dependencies via ppm when building")
     proj_build.add_argument("--no-cache", action="store_true", dest="no_cache", help="Do not use the build cache for this build")
 
+
+def _build_build(build_cmd):
     # Top-level build command (can build a project or a single file)
-    build_cmd = subparsers.add_parser("build", help="Build a Pryzma project or file")
     build_cmd.add_argument("proj_name", nargs="?", help="Name of the project to build")
     build_cmd.add_argument("-f", "--file", dest="file", help="Build a single .pryzma file instead of a project")
     build_cmd.add_argument("-a", "--auto-fetch", action="store_true", dest="auto_fetch", help="Automatically fetch missing Pryzma package dependencies via ppm when building")
     build_cmd.add_argument("--no-cache", action="store_true", dest="no_cache", help="Do not use the build cache for this build")
 
-    # Run command
-    run_parser = subparsers.add_parser("run", help="Run a Pryzma script")
+
+def _build_run(run_parser):
     run_parser.add_argument("path", nargs="?", help="Path to .pryzma script")
     run_parser.add_argument("-d", "--debug", action="store_true", help="Flag used to run in debug mode")
 
-    # Compile command
-    compile_parser = subparsers.add_parser("compile", help="Compile a Pryzma script")
+
+def _build_compile(compile_parser):
     compile_parser.add_argument("path", nargs="?", help="Path to .pryzma script")
 
-    # Venv group
-    venv_parser = subparsers.add_parser("venv", help="Manage Pryzma virtual environments")
+
+def _build_venv(venv_parser):
     venv_subparsers = venv_parser.add_subparsers(dest="venv_command")
 
     venv_create = venv_subparsers.add_parser("create", help="Create a virtual environment")
     venv_create.add_argument("name", help="Name of the virtual environment")
 
-    venv_create = venv_subparsers.add_parser("remove", help="Remove a virtual environment")
-    venv_create.add_argument("name", help="Name of the virtual environment")
+    venv_remove = venv_subparsers.add_parser("remove", help="Remove a virtual environment")
+    venv_remove.add_argument("name", help="Name of the virtual environment")
+    venv_remove.add_argument("-y", "--yes", action="store_true", help="Don't ask for confirmation")
 
     venv_subparsers.add_parser("list", help="List virtual environments")
 
@@ -2087,17 +2549,21 @@ def build_parser():
     venv_run = venv_subparsers.add_parser("run", help="Run the interpreter from a give venv")
     venv_run.add_argument("venv_name", help="Name of the virtual environment")
 
-    # ictfd runner
-    ictfd_parser = subparsers.add_parser("ictfd", help="Run ictfd with provided arguments")
+
+def _build_ictfd(ictfd_parser):
+    import argparse
+
     ictfd_parser.add_argument("ictfd_args", nargs=argparse.REMAINDER, help="Arguments for ictfd")
 
-    #ppm parser
-    ppm = subparsers.add_parser("ppm", help="Pryzma package manager")
+
+def _build_ppm(ppm):
     ppm.add_argument("action", choices=["install", "list", "remove", "info", "update", "fetch"])
-    ppm.add_argument("package", nargs="?")
+    ppm.add_argument("package", nargs="?", help="Package name")
+    # Kept separate from `package` so a missing name is still reported per action
+    ppm.add_argument("more_packages", nargs="*", default=[], metavar="package", help="More packages to act on in the same call")
 
-    # Mirrors management for ppm
-    mirrors_parser = subparsers.add_parser("mirrors", help="Manage ppm mirrors")
+
+def _build_mirrors(mirrors_parser):
     mirrors_sub = mirrors_parser.add_subparsers(dest="mirrors_action")
 
     mirrors_add = mirrors_sub.add_parser("add", help="Add a mirror (base URL)")
@@ -2114,29 +2580,23 @@ def build_parser():
     mirrors_test = mirrors_sub.add_parser("test", help="Test mirrors for latency and reachability")
     mirrors_test.add_argument("--global", action="store_true", dest="use_global", help="Test mirrors defined in global config instead of local")
 
-    # Config command
-    config_parser = subparsers.add_parser("config", help="Manage configuration")
+
+def _build_config(config_parser):
     config_subparsers = config_parser.add_subparsers(dest="config_action")
     show_parser = config_subparsers.add_parser("show", help="Show config")
 
     set_parser = config_subparsers.add_parser("set", help="Set configuration value")
     set_parser.add_argument("key", help="Configuration key to set")
     set_parser.add_argument("value", help="Value to set")
-    set_parser.add_argument("--global", action="store_true", help="Save to global config")
+    set_parser.add_argument("--global", action="store_true", dest="is_global", help="Save to global config")
 
     remove_parser = config_subparsers.add_parser("remove", help="Remove a configuration key")
     remove_parser.add_argument("key", help="Key to remove")
-    remove_parser.add_argument("--global", action="store_true", help="Remove from global config")
+    remove_parser.add_argument("--global", action="store_true", dest="is_global", help="Remove from global config")
 
-    plugin_parser = subparsers.add_parser("plugin", help="Manage plugins")
-    plugin_subparsers = plugin_parser.add_subparsers(dest="plugin_command")
 
-    # Cache management
-    cache_parser = subparsers.add_parser("cache", help="Manage build cache")
-    cache_sub = cache_parser.add_subparsers(dest="cache_action")
-    cache_clean = cache_sub.add_parser("clean", help="Clear entire build cache")
-    cache_prune = cache_sub.add_parser("prune", help="Prune build cache to keep at most N entries")
-    cache_prune.add_argument("--max", type=int, default=MAX_BUILD_CACHE_ENTRIES, help="Maximum cache subdirectories to keep")
+def _build_plugin(plugin_parser):
+    plugin_subparsers = plugin_parser.add_subparsers(dest="plugin_command")
 
     list_parser = plugin_subparsers.add_parser("list", help="List plugins")
     list_parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed plugin info")
@@ -2149,8 +2609,15 @@ def build_parser():
     info_parser = plugin_subparsers.add_parser("info", help="Show plugin details")
     info_parser.add_argument("name", help="Plugin name")
 
-    # Notes command
-    notes_parser = subparsers.add_parser("notes", help="Manage notes")
+
+def _build_cache(cache_parser):
+    cache_sub = cache_parser.add_subparsers(dest="cache_action")
+    cache_clean = cache_sub.add_parser("clean", help="Clear entire build cache")
+    cache_prune = cache_sub.add_parser("prune", help="Prune build cache to keep at most N entries")
+    cache_prune.add_argument("--max", type=int, default=MAX_BUILD_CACHE_ENTRIES, help="Maximum cache subdirectories to keep")
+
+
+def _build_notes(notes_parser):
     notes_subparsers = notes_parser.add_subparsers(dest="notes_action")
 
     list_parser = notes_subparsers.add_parser("list", help="List all notes for a given project")
@@ -2164,158 +2631,332 @@ def build_parser():
     notes_add_parser.add_argument("project_name", help="Name of the project")
     notes_add_parser.add_argument("note", help="note content")
 
+
+# Top-level subcommands: name -> (help, builder). Builders fill in the
+# arguments of an already created subparser so that only the requested
+# command has to be constructed.
+SUBCOMMANDS = {
+    "proj": ("Project management commands", _build_proj),
+    "build": ("Build a Pryzma project or file", _build_build),
+    "run": ("Run a Pryzma script", _build_run),
+    "compile": ("Compile a Pryzma script", _build_compile),
+    "venv": ("Manage Pryzma virtual environments", _build_venv),
+    "ictfd": ("Run ictfd with provided arguments", _build_ictfd),
+    "ppm": ("Pryzma package manager", _build_ppm),
+    "mirrors": ("Manage ppm mirrors", _build_mirrors),
+    "config": ("Manage configuration", _build_config),
+    "plugin": ("Manage plugins", _build_plugin),
+    "cache": ("Manage build cache", _build_cache),
+    "notes": ("Manage notes", _build_notes),
+}
+
+
+# Commands that work on the projects/venvs directories
+ENV_COMMANDS = {"proj", "venv"}
+
+# Attribute holding the second word for commands with their own subcommands
+SUBCOMMAND_DESTS = {"proj": "proj_command", "venv": "venv_command"}
+
+# Plain invocations that main() can take without building argparse at all:
+# leading words -> (positional names, defaults, store_true flags -> dest).
+# A positional with an entry in defaults is optional.
+FAST_COMMANDS = {
+    ("run",): (("path",), {"path": None, "debug": False}, {"-d": "debug", "--debug": "debug"}),
+    ("proj", "init"): (("name",), {"name": None, "interactive": False, "template": "basic", "git": False, "git_ignore": False},
+                       {"-i": "interactive", "--interactive": "interactive", "-g": "git", "--git": "git", "-gi": "git_ignore", "--git-ignore": "git_ignore"}),
+    ("proj", "remove"): (("name",), {"yes": False}, {"-y": "yes", "--yes": "yes"}),
+    ("proj", "list"): ((), {"detailed": False}, {"-d": "detailed", "--detailed": "detailed"}),
+    ("proj", "info"): (("name",), {}, {}),
+    ("proj", "add"): (("path",), {}, {}),
+    ("proj", "run"): (("name",), {"debug": False}, {"-d": "debug", "--debug": "debug"}),
+    ("proj", "install"): (("name",), {}, {}),
+    ("proj", "test"): (("proj_name",), {}, {}),
+    ("proj", "build"): (("proj_name",), {"auto_fetch": False, "no_cache": False},
+                        {"-a": "auto_fetch", "--auto-fetch": "auto_fetch", "--no-cache": "no_cache"}),
+    ("venv", "create"): (("name",), {}, {}),
+    ("venv", "remove"): (("name",), {"yes": False}, {"-y": "yes", "--yes": "yes"}),
+    ("venv", "list"): ((), {}, {}),
+    ("venv", "link"): (("venv_name", "project_name"), {}, {}),
+    ("venv", "unlink"): (("project_name",), {}, {}),
+    ("venv", "run"): (("venv_name",), {}, {}),
+}
+
+
+def fast_parse(argv):
+    """Parse the common command lines by table lookup.
+
+    Returns a namespace shaped like the argparse result (without importing
+    argparse), or None when the command line needs the real parser (unknown
+    options, help, wrong arity).
+    """
+    if argv and argv[0] == "ictfd":
+        return SimpleNamespace(command="ictfd", ictfd_args=argv[1:])
+
+    for words in (tuple(argv[:2]), tuple(argv[:1])):
+        spec = FAST_COMMANDS.get(words)
+        if spec:
+            break
+    else:
+        return None
+
+    positionals, defaults, flags = spec
+    args = SimpleNamespace(command=words[0], **defaults)
+
+    values = []
+    for arg in argv[len(words):]:
+        if not arg.startswith("-"):
+            values.append(arg)
+        elif arg in flags:
+            setattr(args, flags[arg], True)
+        else:
+            return None
+
+    if len(values) > len(positionals) or any(dest not in defaults for dest in positionals[len(values):]):
+        return None
+
+    if len(words) > 1:
+        setattr(args, SUBCOMMAND_DESTS[words[0]], words[1])
+    for dest, value in zip(positionals, values):
+        setattr(args, dest, value)
+    return args
+
+
+def build_parser(argv=None):
+    """Build the argument parser.
+
+    When `argv` names a built-in command only that subparser is constructed.
+    Everything else (help, plugin commands, typos) only needs the command names,
+    so the built-ins are added as empty stubs.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="pryzma-manager", description="Manage Pryzma projects and environments and more")
+    # Handled in main() before parsing, only here so it shows up in --help
+    parser.add_argument("--no-plugins", action="store_true",
+                        help="Don't load plugins (same as PRYZMA_NO_PLUGINS=1)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    command = argv[0] if argv else None
+
+    if command in SUBCOMMANDS:
+        help_text, builder = SUBCOMMANDS[command]
+        builder(subparsers.add_parser(command, help=help_text))
+    else:
+        for name, (help_text, _) in SUBCOMMANDS.items():
+            subparsers.add_parser(name, help=help_text)
+
     return parser
 
-def main():
-    init_main_env()
-    parser = build_parser()
+def _build_command(args):
+    if getattr(args, 'file', None):
+        build_file(args.file, getattr(args, 'auto_fetch', False), getattr(args, 'no_cache', False))
+    elif getattr(args, 'proj_name', None):
+        build_project(args)
+    else:
+        print("[build] Please specify a project name or use -f/--file to build a single file.")
 
-    load_plugins(parser)
 
-    args = parser.parse_args()
+def _config_show(args):
+    config = load_config()
+    sys.stdout.write("Current configuration:\n" + "".join(f"{key}: {value}\n" for key, value in config.items()))
+
+
+def _plugin_list(args):
+    plugins = list_plugins()
+    if args.verbose:
+        print("\nDetailed info:")
+        for plugin in plugins:
+            show_plugin_info(plugin["name"], plugin["disabled"])
+            print()
 
-    if hasattr(args, 'func'):
-        args.func(args)
+
+def _plugin_toggle(args):
+    if args.enable:
+        toggle_plugin(args.name, enable=True)
+    elif args.disable:
+        toggle_plugin(args.name, enable=False)
+    else:
+        plugins = list_plugins(show_all=True)
+        for p in plugins:
+            if p["name"] == args.name:
+                toggle_plugin(args.name, enable=p["disabled"])
+                return
+        print(f"Plugin not found: {args.name}")
+
+
+def _ictfd_command(args):
+    # exec would happily start python on a missing script, so check first
+    if not os.path.isfile(ICTFD_SCRIPT):
+        print(f"[tools] ictfd not found")
         return
 
-    if args.command == "proj":
-        if args.proj_command == "init":
-            init_project(name=args.name, interactive=args.interactive, template=args.template, use_git=args.git, create_gitignore=args.git_ignore)
-        elif args.proj_command == "remove":
-            remove_project(args.name)
-        elif args.proj_command == "list":
-            list_projects(args.detailed)
-        elif args.proj_command == "info":
-            show_project_info(args.name)
-        elif args.proj_command == "add":
-            add_project(args.path)
-        elif args.proj_command == "run":
-            run_project(args.name, args.debug)
-        elif args.proj_command == "install":
-            install_dependencies(args.name)
-        elif args.proj_command == "test":
-            test_project(args)
-        elif args.proj_command == "build":
-            build_project(args)
-        else:
-            print("[proj] Unknown project subcommand.")
-    elif args.command == "run":
-        run_script(args.path, args.debug)
-    elif args.command == "build":
-        if getattr(args, 'file', None):
-            build_file(args.file, getattr(args, 'auto_fetch', False), getattr(args, 'no_cache', False))
-        elif getattr(args, 'proj_name', None):
-            build_project(args)
-        else:
-            print("[build] Please specify a project name or use -f/--file to build a single file.")
-    elif args.command == "compile":
-        compile_script(args.path)
-    elif args.command == "venv":
-        if args.venv_command == "create":
-            venv_command("create", getattr(args, "name", None))
-        elif args.venv_command == "remove":
-            venv_command("remove", getattr(args, "name", None))
-        elif args.venv_command == "list":
-            venv_command("list")
-        elif args.venv_command == "link":
-            venv_command("link", args.venv_name, args.project_name)
-        elif args.venv_command == "unlink":
-            venv_command("unlink", args.project_name)
-        elif args.venv_command == "run":
-            venv_command("run", args.venv_name)
-        else:
-            print("[venv] Unknown venv subcommand.")
-    elif args.command == "ppm":
-        if args.action == "install" and args.package:
-            ppm_install(args.package)
-        elif args.action == "list":
-            ppm_list()
-        elif args.action == "remove" and args.package:
-            ppm_remove(args.package)
-        elif args.action == "info" and args.package:
-            ppm_info(args.package)
-        elif args.action == "update":
-            if args.package:
-                ppm_update_package(args.package)
-            else:
-                ppm_update_all()
-        elif args.action == "fetch":
-            ppm_fetch_and_print_packages()
-        else:
-            print("Invalid command or missing package name.")
-    elif args.command == "config":
-        if args.config_action == "show":
-            config = load_config()
-            print("Current configuration:")
-            for key, value in config.items():
-                print(f"{key}: {value}")
-        elif args.config_action == "set":
-            set_config_value(args.key, args.value, getattr(args, "global", False))
-        elif args.config_action == "remove":
-            remove_config_key(args.key, getattr(args, "global", False))
-        else:
-            print("[config] Unknown config subcommand.")
-    elif args.command == "plugin":
-        if args.plugin_command == "list":
-            plugins = list_plugins()
-            if args.verbose:
-                print("\nDetailed info:")
-                for plugin in plugins:
-                    show_plugin_info(plugin["name"])
-                    print()
-            return
-        elif args.plugin_command == "toggle":
-            if args.enable:
-                toggle_plugin(args.name, enable=True)
-            elif args.disable:
-                toggle_plugin(args.name, enable=False)
-            else:
-                plugins = list_plugins(show_all=True)
-                for p in plugins:
-                    if p["name"] == args.name:
-                        toggle_plugin(args.name, enable=p["disabled"])
-                        return
-                print(f"Plugin not found: {args.name}")
-            return
-        elif args.plugin_command == "info":
-            show_plugin_info(args.name)
-            return
-    elif args.command == "notes":
-        if args.notes_action == "list":
-            notes_list(args.project_name)
-        elif args.notes_action == "remove":
-            notes_remove(args.project_name, args.line)
-        elif args.notes_action == "add":
-            notes_add(args.project_name, args.note)
-        else:
-            print("[notes] Unknown notes subcommand.")
-    elif args.command == "mirrors":
-        if args.mirrors_action == "list":
-            ppm_mirrors_list()
-        elif args.mirrors_action == "add":
-            ppm_mirrors_add(args.url)
-        elif args.mirrors_action == "remove":
-            ppm_mirrors_remove(args.id)
-        elif args.mirrors_action == "test":
-            ppm_mirrors_test()
-        else:
-            print("[mirrors] Unknown mirrors subcommand.")
-    elif args.command == "cache":
-        if args.cache_action == "clean":
-            clear_build_cache()
-        elif args.cache_action == "prune":
-            prune_build_cache(getattr(args, 'max', MAX_BUILD_CACHE_ENTRIES))
+    # ictfd is the last thing this invocation does, so replace the process
+    exec_python([ICTFD_SCRIPT, *args.ictfd_args])
+
+
+# Second-level handlers, keyed on the subcommand word
+PROJ_COMMANDS = {
+    "init": lambda a: init_project(name=a.name, interactive=a.interactive, template=a.template, use_git=a.git, create_gitignore=a.git_ignore),
+    "remove": lambda a: remove_project(a.name, a.yes),
+    "list": lambda a: list_projects(a.detailed),
+    "info": lambda a: show_project_info(a.name),
+    "add": lambda a: add_project(a.path),
+    "run": lambda a: run_project(a.name, a.debug),
+    "install": lambda a: install_dependencies(a.name),
+    "test": lambda a: test_project(a),
+    "build": lambda a: build_project(a),
+}
+
+VENV_COMMANDS = {
+    "create": lambda a: venv_command("create", getattr(a, "name", None)),
+    "remove": lambda a: venv_command("remove", getattr(a, "name", None), yes=a.yes),
+    "list": lambda a: venv_command("list"),
+    "link": lambda a: venv_command("link", a.venv_name, a.project_name),
+    "unlink": lambda a: venv_command("unlink", a.project_name),
+    "run": lambda a: venv_command("run", a.venv_name),
+}
+
+def _ppm_each(action, parallel=False, when_empty=None):
+    """Return a handler running action(name) for every package on the command line"""
+    def handler(args):
+        names = [args.package, *args.more_packages] if args.package else []
+        packages = list(dict.fromkeys(names))
+        if not packages and when_empty:
+            when_empty()
+        elif parallel and len(packages) > 1:
+            ppm_run_parallel(action, packages)
         else:
-            print("[cache] Unknown cache subcommand.")
-    elif args.command and args.command.startswith("ictfd"):
-        ictfd_script = os.path.join(PRYZMA_PATH, "tools", "ictfd.py")
-        if not os.path.exists(ictfd_script):
-            print(f"[tools] ictfd not found")
-            return
+            for package in packages:
+                action(package)
+    return handler
+
+
+PPM_COMMANDS = {
+    "install": _ppm_each(ppm_install, parallel=True),
+    "list": lambda a: ppm_list(),
+    "remove": _ppm_each(ppm_remove),
+    "info": _ppm_each(ppm_info),
+    "update": _ppm_each(ppm_update_package, parallel=True, when_empty=ppm_update_all),
+    "fetch": lambda a: ppm_fetch_and_print_packages(),
+}
 
-        subprocess.run([sys.executable, ictfd_script] + args.ictfd_args)
-    else:
+# ppm actions that can't run without the package argument
+PPM_PACKAGE_ACTIONS = {"install", "remove", "info"}
+
+CONFIG_COMMANDS = {
+    "show": _config_show,
+    "set": lambda a: set_config_value(a.key, a.value, a.is_global),
+    "remove": lambda a: remove_config_key(a.key, a.is_global),
+}
+
+PLUGIN_COMMANDS = {
+    "list": _plugin_list,
+    "toggle": _plugin_toggle,
+    "info": lambda a: show_plugin_info(a.name),
+}
+
+NOTES_COMMANDS = {
+    "list": lambda a: notes_list(a.project_name),
+    "remove": lambda a: notes_remove(a.project_name, a.line),
+    "add": lambda a: notes_add(a.project_name, a.note),
+}
+
+MIRRORS_COMMANDS = {
+    "list": lambda a: ppm_mirrors_list(),
+    "add": lambda a: ppm_mirrors_add(a.url),
+    "remove": lambda a: ppm_mirrors_remove(a.id),
+    "test": lambda a: ppm_mirrors_test(),
+}
+
+CACHE_COMMANDS = {
+    "clean": lambda a: clear_build_cache(),
+    "prune": lambda a: prune_build_cache(getattr(a, 'max', MAX_BUILD_CACHE_ENTRIES)),
+}
+
+
+# Printed when a command is given an unknown (or no) subcommand
+UNKNOWN_SUBCOMMAND_MESSAGES = {
+    "proj": "[proj] Unknown project subcommand.",
+    "venv": "[venv] Unknown venv subcommand.",
+    "ppm": "Invalid command or missing package name.",
+    "config": "[config] Unknown config subcommand.",
+    "notes": "[notes] Unknown notes subcommand.",
+    "mirrors": "[mirrors] Unknown mirrors subcommand.",
+    "cache": "[cache] Unknown cache subcommand.",
+}
+
+
+def _unknown_subcommand(args):
+    message = UNKNOWN_SUBCOMMAND_MESSAGES.get(args.command)
+    if message:
+        print(message)
+
+
+def _ppm_command(args):
+    handler = PPM_COMMANDS.get(args.action)
+    if not handler or (args.action in PPM_PACKAGE_ACTIONS and not args.package):
+        handler = _unknown_subcommand
+    handler(args)
+
+
+def _subcommand_dispatcher(table, dest):
+    """Return a handler that runs table[getattr(args, dest)]"""
+    def dispatch(args):
+        table.get(getattr(args, dest, None), _unknown_subcommand)(args)
+    return dispatch
+
+
+COMMANDS = {
+    "proj": _subcommand_dispatcher(PROJ_COMMANDS, "proj_command"),
+    "run": lambda a: run_script(a.path, a.debug),
+    "build": _build_command,
+    "compile": lambda a: compile_script(a.path),
+    "venv": _subcommand_dispatcher(VENV_COMMANDS, "venv_command"),
+    "ppm": _ppm_command,
+    "config": _subcommand_dispatcher(CONFIG_COMMANDS, "config_action"),
+    "plugin": _subcommand_dispatcher(PLUGIN_COMMANDS, "plugin_command"),
+    "notes": _subcommand_dispatcher(NOTES_COMMANDS, "notes_action"),
+    "mirrors": _subcommand_dispatcher(MIRRORS_COMMANDS, "mirrors_action"),
+    "cache": _subcommand_dispatcher(CACHE_COMMANDS, "cache_action"),
+    "ictfd": _ictfd_command,
+}
+
+
+def main():
+    argv = sys.argv[1:]
+    no_plugins = os.environ.get("PRYZMA_NO_PLUGINS", "").lower() in TRUTHY_ENV_VALUES
+    if argv[:1] == ["--no-plugins"]:
+        argv = argv[1:]
+        no_plugins = True
+
+    parser = None
+    args = fast_parse(argv)
+
+    if args is None:
+        parser = build_parser(argv)
+
+        # Plugins can only own commands that aren't built in
+        if not no_plugins and (not argv or argv[0] not in SUBCOMMANDS):
+            load_plugins(parser, argv[0] if argv else None)
+
+        args = parser.parse_args(argv)
+
+    if args.command in ENV_COMMANDS:
+        init_main_env()
+
+    # Plugin subparsers set func; built-ins are looked up by command name
+    handler = getattr(args, "func", None) or COMMANDS.get(args.command)
+
+    if not handler:
         parser.print_help()
+        return
+
+    # Handlers like run/ppm can run for a while, don't keep the parser alive for them
+    del parser
+    try:
+        handler(args)
+    except InvalidProjectName as e:
+        print(f"[error] Invalid project name '{e}'.")
 
 
 if __name__ == "__main__":
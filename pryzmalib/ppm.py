@@ -8,6 +8,11 @@ import zipfile
 import io
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PACKAGES_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "Pryzma-programming-language", "packages")
 
 def install(package_name):
@@ -72,6 +77,12 @@ def remove(package_name):
     else:
         return False
 
+def json_loads(data):
+    """json.loads, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def info(package_name):
     metadata_path = os.path.join(PACKAGES_DIR, package_name, "metadata.json")
 
@@ -79,8 +90,8 @@ def info(package_name):
         return None
 
     try:
-        with open(metadata_path, "r") as f:
-            data = json.load(f)
+        with open(metadata_path, "rb") as f:
+            data = json_loads(f.read())
         return data
     except Exception as e:
         print(f"Error reading metadata: {e}")
@@ -0,0 +1,69 @@
+import io
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pryzma_manager
+
+
+class NotesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(pryzma_manager, "PROJECTS_PATH", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        os.makedirs(os.path.join(self.tmp.name, "proj"))
+        self.notes_file = os.path.join(self.tmp.name, "proj", "notes")
+
+    def run_quietly(self, func, *args):
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            func(*args)
+        return out.getvalue()
+
+    def test_remove_keeps_file_mode(self):
+        with open(self.notes_file, "wb") as f:
+            f.write(b"one\ntwo\n")
+        os.chmod(self.notes_file, 0o600)
+
+        self.run_quietly(pryzma_manager.notes_remove, "proj", "1")
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.notes_file).st_mode), 0o600)
+        with open(self.notes_file, "rb") as f:
+            self.assertEqual(f.read(), b"two\n")
+
+    def test_remove_writes_through_symlink(self):
+        target = os.path.join(self.tmp.name, "shared_notes")
+        with open(target, "wb") as f:
+            f.write(b"one\ntwo\n")
+        os.symlink(target, self.notes_file)
+
+        self.run_quietly(pryzma_manager.notes_remove, "proj", "2")
+
+        self.assertTrue(os.path.islink(self.notes_file))
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), b"one\n")
+
+    def test_list_survives_undecodable_bytes(self):
+        with open(self.notes_file, "wb") as f:
+            f.write(b"caf\xe9\n")
+
+        out = self.run_quietly(pryzma_manager.notes_list, "proj")
+
+        self.assertEqual(out, "Notes for project 'proj':\n[1] caf�\n")
+
+    def test_names_outside_projects_are_rejected(self):
+        for name in ("../proj", "proj/sub", ".hidden"):
+            with self.assertRaises(pryzma_manager.InvalidProjectName):
+                pryzma_manager.notes_list(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pryzma_manager
+
+
+def parse(argv):
+    return pryzma_manager.build_parser(argv).parse_args(argv)
+
+
+class PpmParserTest(unittest.TestCase):
+    def test_bare_ppm_only_reports_missing_action(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err), self.assertRaises(SystemExit):
+            parse(["ppm"])
+        self.assertIn("the following arguments are required: action\n", err.getvalue())
+
+    def test_install_without_package_reports_missing_name(self):
+        args = parse(["ppm", "install"])
+        self.assertIsNone(args.package)
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), mock.patch.object(pryzma_manager, "ppm_install") as install:
+            pryzma_manager.COMMANDS["ppm"](args)
+        install.assert_not_called()
+        self.assertEqual(out.getvalue(), "Invalid command or missing package name.\n")
+
+    def test_update_accepts_several_packages(self):
+        args = parse(["ppm", "update", "a", "b"])
+        self.assertEqual((args.package, args.more_packages), ("a", ["b"]))
+
+        with mock.patch.object(pryzma_manager, "ppm_run_parallel") as run_parallel:
+            pryzma_manager.COMMANDS["ppm"](args)
+        run_parallel.assert_called_once_with(pryzma_manager.ppm_update_package, ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pryzma_manager
+
+
+class PpmUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(pryzma_manager, "PACKAGES_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.package_path = os.path.join(self.tmp.name, "foo")
+        os.makedirs(self.package_path)
+        with open(os.path.join(self.package_path, "foo.pryzma"), "w") as f:
+            f.write("old\n")
+
+    def assert_old_copy_restored(self):
+        self.assertEqual(os.listdir(self.tmp.name), ["foo"])
+        self.assertEqual(os.listdir(self.package_path), ["foo.pryzma"])
+
+    def test_install_raising_restores_old_copy(self):
+        def broken_install(name, log=print):
+            os.makedirs(os.path.join(self.package_path, "partial"))
+            raise OSError("extract failed")
+
+        with mock.patch.object(pryzma_manager, "ppm_install", broken_install):
+            with self.assertRaises(OSError):
+                pryzma_manager.ppm_update_package("foo", log=lambda msg: None)
+
+        self.assert_old_copy_restored()
+
+    def test_install_interrupted_restores_old_copy(self):
+        def interrupted_install(name, log=print):
+            raise KeyboardInterrupt
+
+        with mock.patch.object(pryzma_manager, "ppm_install", interrupted_install):
+            with self.assertRaises(KeyboardInterrupt):
+                pryzma_manager.ppm_update_package("foo", log=lambda msg: None)
+
+        self.assert_old_copy_restored()
+
+    def test_install_failing_restores_old_copy(self):
+        with mock.patch.object(pryzma_manager, "ppm_install", return_value=False):
+            self.assertFalse(pryzma_manager.ppm_update_package("foo", log=lambda msg: None))
+
+        self.assert_old_copy_restored()
+
+    def test_missing_package_is_reported(self):
+        messages = []
+        self.assertFalse(pryzma_manager.ppm_update_package("nope", log=messages.append))
+        self.assertEqual(messages, ["Package 'nope' not found."])
+
+
+class PpmListTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(pryzma_manager, "PACKAGES_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_leftover_backup_and_staging_dirs_are_not_packages(self):
+        for name in ("foo", "foo.123.old", ".ppm_bar_abc123"):
+            os.makedirs(os.path.join(self.tmp.name, name))
+        open(os.path.join(self.tmp.name, "stray.zip"), "w").close()
+
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            pryzma_manager.ppm_list()
+
+        self.assertEqual(out.getvalue(), "Installed packages:\n- foo\n")
+
+
+class SafeTarMemberTest(unittest.TestCase):
+    def member(self, name, type=tarfile.REGTYPE):
+        info = tarfile.TarInfo(name)
+        info.type = type
+        return info
+
+    def test_plain_members_are_allowed(self):
+        self.assertTrue(pryzma_manager.is_safe_tar_member(self.member("foo/sub/a.pryzma")))
+        self.assertTrue(pryzma_manager.is_safe_tar_member(self.member("foo/sub", tarfile.DIRTYPE)))
+
+    def test_escaping_paths_are_rejected(self):
+        for name in ("/etc/passwd", "foo/../../x", "..", "foo\\..\\..\\x"):
+            self.assertFalse(pryzma_manager.is_safe_tar_member(self.member(name)), name)
+
+    def test_links_and_devices_are_rejected(self):
+        for type in (tarfile.SYMTYPE, tarfile.LNKTYPE, tarfile.CHRTYPE, tarfile.FIFOTYPE):
+            self.assertFalse(pryzma_manager.is_safe_tar_member(self.member("foo/x", type)))
+
+
+if __name__ == "__main__":
+    unittest.main()